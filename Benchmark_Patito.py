@@ -0,0 +1,669 @@
+# Benchmark runner for the 'Patito' pipeline.
+#
+# Times lexing, parsing, allocate_memory and execute separately on the sample
+# programs and on generated ones, and stores the results as JSON so two
+# commits can be compared.
+#
+# Usage:
+#   python Benchmark_Patito.py --output before.json
+#   python Benchmark_Patito.py --output after.json --compare before.json
+import argparse
+import io
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+from Disassembler_Patito import FORMATS, disassemble
+from Generator_Patito import SHAPES, generate_program
+from Linker_Patito import Linker
+from Scanner_Parser_Patito import PatitoLexer, PatitoParser
+from Stream_Lexer_Patito import tokenize
+from Vector_VM_Patito import Vector_Virtual_Machine
+from Virtual_Machine import Input_Reader, Program, Virtual_Machine
+
+SAMPLE_FILES = ['main_VM.txt', 'test_elseif.txt']
+# Ratio of new/old best time above which a phase is reported as a regression
+REGRESSION_THRESHOLD = 1.10
+
+
+#####################################################
+# Helpers
+#####################################################
+def summarize(samples):
+    return {'best': min(samples), 'median': statistics.median(samples)}
+
+
+def git_commit():
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# Lexer and parser shared by every measurement, like a warm service would
+class Pipeline:
+    def __init__(self):
+        self.lexer = PatitoLexer()
+        self.parser = PatitoParser(quads=[], var_table={}, cte_table={})
+
+    def lex(self, source):
+        self.lexer.lineno = 1
+        self.lexer.input(source)
+        count = 0
+        while self.lexer.token():
+            count += 1
+        return count
+
+    def parse(self, source):
+        quads, var_table, cte_table = [], {}, {}
+        self.parser.reset(quads, var_table, cte_table)
+        self.lexer.lineno = 1
+        diagnostics = io.StringIO()
+        with redirect_stdout(diagnostics):
+            self.parser.parse(source, lexer=self.lexer)
+        if diagnostics.getvalue():
+            raise ValueError('Program did not compile: ' + diagnostics.getvalue().strip())
+        return quads, var_table, cte_table
+
+
+#####################################################
+# Workloads
+#####################################################
+def load_workloads(size, large_size):
+    workloads = []
+    for file_name in SAMPLE_FILES:
+        with open(file_name, 'r') as file:
+            workloads.append((file_name, file.read(), True))
+    for shape in sorted(SHAPES):
+        workloads.append((f'{shape}-{size}', generate_program(shape, size), True))
+    # Too big to fit the memory segments, only lexed and parsed
+    if large_size:
+        workloads.append((f'variables-{large_size}',
+                          generate_program('variables', large_size, check_memory=False), False))
+    return workloads
+
+
+def measure(pipeline, source, runnable, repeat):
+    samples = {'lex': [], 'parse': []}
+    if runnable:
+        # allocate_memory is timed through Program construction, which runs
+        # allocate_memory, save_cte and decode. instance is the per run cost.
+        samples['allocate_memory'] = []
+        samples['instance'] = []
+        samples['execute'] = []
+    tokens = quads_count = 0
+    with open(os.devnull, 'w') as devnull:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            tokens = pipeline.lex(source)
+            samples['lex'].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            quads, var_table, cte_table = pipeline.parse(source)
+            samples['parse'].append(time.perf_counter() - start)
+            quads_count = len(quads)
+            if not runnable:
+                continue
+
+            start = time.perf_counter()
+            program = Program(quads, var_table, cte_table)
+            samples['allocate_memory'].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            vm = program.instance(devnull)
+            samples['instance'].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            vm.execute()
+            samples['execute'].append(time.perf_counter() - start)
+    return {
+        'source_bytes': len(source),
+        'tokens': tokens,
+        'quads': quads_count,
+        'phases': {phase: summarize(values) for phase, values in samples.items()},
+    }
+
+
+def run_pipeline_suite(args):
+    pipeline = Pipeline()
+    results = {}
+    for name, source, runnable in load_workloads(args.size, args.large_size):
+        results[name] = measure(pipeline, source, runnable, args.repeat)
+        print_result(name, results[name])
+    return results
+
+
+# Token count of a whole file read at once and lexed by PatitoLexer
+def lex_file_ply(path):
+    lexer = PatitoLexer()
+    with open(path, 'r') as file:
+        lexer.input(file.read())
+    count = 0
+    while lexer.token():
+        count += 1
+    return count
+
+
+# Token count of a file read in chunks by the streaming lexer
+def lex_file_stream(path):
+    with open(path, 'r') as file:
+        return sum(1 for _ in tokenize(file))
+
+
+def run_lexer_suite(args):
+    results = {}
+    source = generate_program('mixed', args.lexer_size, check_memory=False)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'source.txt')
+        with open(path, 'w') as file:
+            file.write(source)
+        for name, lex_file in (('ply', lex_file_ply), ('stream', lex_file_stream)):
+            samples = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                tokens = lex_file(path)
+                samples.append(time.perf_counter() - start)
+            # Memory is measured in a separate run, tracemalloc slows everything down
+            tracemalloc.start()
+            lex_file(path)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            results[name] = {
+                'source_bytes': len(source),
+                'tokens': tokens,
+                'tokens_per_second': tokens / min(samples),
+                'peak_memory_bytes': peak,
+                'phases': {'lex': summarize(samples)},
+            }
+            print(f'{name:<8} {tokens} tokens  {tokens / min(samples):12.0f} tokens/s  '
+                  f'peak {peak / 1024 / 1024:8.2f} MB  ({len(source) / 1024 / 1024:.1f} MB source)')
+    return results
+
+
+# Program that only declares variables, in groups of group_size per type clause
+def declarations_program(count, group_size = 10):
+    lines = ['program Declarations;', '']
+    for i in range(0, count, group_size):
+        names = ', '.join(f'v{j}' for j in range(i, min(count, i + group_size)))
+        var_type = 'int' if (i // group_size) % 2 == 0 else 'float'
+        lines.append(('var ' if i == 0 else '') + f'{names}: {var_type};')
+    lines += ['{', '}', 'end', '']
+    return '\n'.join(lines)
+
+
+def run_declarations_suite(args):
+    pipeline = Pipeline()
+    results = {}
+    for count in args.declarations:
+        source = declarations_program(count)
+        samples = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            quads, var_table, cte_table = pipeline.parse(source)
+            samples.append(time.perf_counter() - start)
+        results[f'declarations-{count}'] = {
+            'variables': len(var_table),
+            'phases': {'parse': summarize(samples)},
+        }
+        print(f'declarations-{count:<9} parse {min(samples) * 1000:10.3f}ms  '
+              f'{min(samples) / count * 1e6:7.2f}us per variable')
+    return results
+
+
+# Disassemble the quadruples of a generated program repeated up to quad_count
+def run_disassembler_suite(args):
+    pipeline = Pipeline()
+    quads, var_table, cte_table = pipeline.parse(generate_program('mixed', args.size))
+    quads = (quads * (args.quad_count // len(quads) + 1))[:args.quad_count]
+    quad_lines = list(range(len(quads)))
+    results = {}
+    with open(os.devnull, 'w') as devnull:
+        for format in FORMATS:
+            for annotate in (False, True):
+                samples = []
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    disassemble(quads, var_table, cte_table, devnull, format, annotate,
+                                quad_lines if annotate else None)
+                    samples.append(time.perf_counter() - start)
+                name = f'{format}{"-annotated" if annotate else ""}'
+                results[name] = {'quads': len(quads), 'phases': {'dump': summarize(samples)}}
+                print(f'{name:<16} {len(quads)} quads  {min(samples):8.3f}s')
+    return results
+
+
+# Save and restore checkpoints of a VM whose memory is grown to each size.
+# Programs cannot address that many cells yet, so the memory is filled directly.
+def run_checkpoint_suite(args):
+    pipeline = Pipeline()
+    with open(SAMPLE_FILES[0], 'r') as file:
+        quads, var_table, cte_table = pipeline.parse(file.read())
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'vm.ckpt')
+        for cells in args.checkpoint_cells:
+            vm = Virtual_Machine(quads, var_table, cte_table)
+            vm.memory = [(i, i * 0.5, i % 2 == 0)[i % 3] for i in range(cells)]
+            save, load = [], []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                vm.save_checkpoint(path)
+                save.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                vm.load_checkpoint(path)
+                load.append(time.perf_counter() - start)
+            size = os.path.getsize(path)
+            results[f'cells-{cells}'] = {
+                'file_bytes': size,
+                'phases': {'save': summarize(save), 'restore': summarize(load)},
+            }
+            print(f'cells-{cells:<10} save {min(save) * 1000:10.3f}ms  restore {min(load) * 1000:10.3f}ms  '
+                  f'file {size / 1024:10.1f} KB')
+    return results
+
+
+# Execute the runnable workloads with unbounded ints and in int64 mode.
+# Programs that overflow int64 (the factorials of main_VM.txt) have no trap time.
+def run_int64_suite(args):
+    pipeline = Pipeline()
+    modes = [('unbounded', {}),
+             ('int64_wrap', {'int_mode': 'int64', 'overflow': 'wrap'}),
+             ('int64_trap', {'int_mode': 'int64', 'overflow': 'trap'})]
+    results = {}
+    with open(os.devnull, 'w') as devnull:
+        for name, source, runnable in load_workloads(args.size, 0):
+            quads, var_table, cte_table = pipeline.parse(source)
+            samples = {mode: [] for mode, _ in modes}
+            overflows = {}
+            for _ in range(args.repeat):
+                for mode, options in modes:
+                    if mode in overflows:
+                        continue
+                    vm = Virtual_Machine(quads, var_table, cte_table, **options)
+                    start = time.perf_counter()
+                    try:
+                        with redirect_stdout(devnull):
+                            vm.execute()
+                    except OverflowError as e:
+                        overflows[mode] = str(e)
+                        continue
+                    samples[mode].append(time.perf_counter() - start)
+            results[name] = {
+                'quads': len(quads),
+                'overflows': overflows,
+                'phases': {mode: summarize(values) for mode, values in samples.items() if values},
+            }
+            print_result(name, results[name])
+            for mode, message in overflows.items():
+                print(f'{"":<22} {mode} stopped: {message}')
+    return results
+
+
+# Per run startup cost: a Virtual_Machine built from the quadruples each time
+# against instances of one shared Program
+def run_startup_suite(args):
+    pipeline = Pipeline()
+    results = {}
+    for name, source, runnable in load_workloads(args.size, 0):
+        quads, var_table, cte_table = pipeline.parse(source)
+        program = Program(quads, var_table, cte_table)
+        samples = {'virtual_machine': [], 'instance': []}
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for _ in range(args.instances):
+                Virtual_Machine(quads, var_table, cte_table)
+            samples['virtual_machine'].append((time.perf_counter() - start) / args.instances)
+            start = time.perf_counter()
+            for _ in range(args.instances):
+                program.instance()
+            samples['instance'].append((time.perf_counter() - start) / args.instances)
+        results[name] = {
+            'quads': len(quads),
+            'memory_cells': len(program.constants),
+            'phases': {phase: summarize(values) for phase, values in samples.items()},
+        }
+        print(f'{name:<22} virtual_machine {min(samples["virtual_machine"]) * 1e6:9.2f}us  '
+              f'instance {min(samples["instance"]) * 1e6:9.2f}us')
+    return results
+
+
+# Sum of values read with cin, one program compiled once for every input size
+INPUT_PROGRAM = '''program INPUT;
+var n, i, value, total: int;
+{
+    cin(n);
+    i = 0;
+    total = 0;
+    do {
+        cin(value);
+        total = total + value;
+        i = i + 1;
+    } while(i < n);
+    cout(total);
+}
+end
+'''
+
+
+# Values read by cin per second, for the reader alone and for a whole program
+def run_input_suite(args):
+    pipeline = Pipeline()
+    program = Program(*pipeline.parse(INPUT_PROGRAM))
+    results = {}
+    for count in args.input_values:
+        text = f'{count}\n' + '\n'.join(str(i) for i in range(count)) + '\n'
+        read, run = [], []
+        for _ in range(args.repeat):
+            reader = Input_Reader(io.StringIO(text))
+            start = time.perf_counter()
+            for _ in range(count + 1):
+                reader.read_int()
+            read.append(time.perf_counter() - start)
+            vm = program.instance(output=io.StringIO(), input=io.StringIO(text))
+            start = time.perf_counter()
+            vm.execute()
+            run.append(time.perf_counter() - start)
+        results[f'values-{count}'] = {
+            'input_bytes': len(text),
+            'values_per_second': count / min(run),
+            'phases': {'read': summarize(read), 'execute': summarize(run)},
+        }
+        print(f'values-{count:<10} read {min(read) * 1000:10.3f}ms  execute {min(run) * 1000:10.3f}ms  '
+              f'{count / min(run):12.0f} values/s')
+    return results
+
+
+# Loop and branches driven by n, run once per lane by the lanes suite
+LANES_PROGRAM = '''program LANES;
+var n, i, total, fib, prev, next: int; ratio: float;
+{
+    i = 0;
+    total = 0;
+    prev = 0;
+    fib = 1;
+    do {
+        total = total + i * i;
+        next = fib + prev;
+        prev = fib;
+        fib = next;
+        i = i + 1;
+    } while(i < n);
+    if (total > 1000) {
+        ratio = total / fib;
+    } else {
+        ratio = 0.5;
+    };
+    cout(n, " ", total, " ", ratio);
+}
+end
+'''
+
+
+# One execute per input set against the lockstep VM running all of them at once.
+# 'same' gives every lane the same loop count, 'mixed' makes lanes diverge.
+def run_lanes_suite(args):
+    import numpy as np
+    pipeline = Pipeline()
+    program = Program(*pipeline.parse(LANES_PROGRAM))
+    rng = np.random.default_rng(0)
+    results = {}
+    for lanes in args.lanes:
+        inputs = {'same': np.full(lanes, 20), 'mixed': rng.integers(5, 30, lanes)}
+        for kind, values in inputs.items():
+            sequential, lockstep = [], []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                for n in values.tolist():
+                    vm = program.instance(io.StringIO())
+                    vm.set_variable('n', n)
+                    vm.execute()
+                sequential.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                Vector_Virtual_Machine(program, {'n': values}).execute()
+                lockstep.append(time.perf_counter() - start)
+            results[f'{kind}-{lanes}'] = {
+                'speedup': min(sequential) / min(lockstep),
+                'phases': {'sequential': summarize(sequential), 'lockstep': summarize(lockstep)},
+            }
+            print(f'{kind + "-" + str(lanes):<16} sequential {min(sequential) * 1000:10.3f}ms  '
+                  f'lockstep {min(lockstep) * 1000:10.3f}ms  {min(sequential) / min(lockstep):7.1f}x')
+    return results
+
+
+# The same counting loop written with for and with do-while
+FOR_PROGRAM = '''program FORLOOP;
+var i, n, total: int;
+{
+    total = 0;
+    for i = 1 to n {
+        total = total + i;
+    };
+}
+end
+'''
+DO_WHILE_PROGRAM = '''program DOWHILE;
+var i, n, m, total: int;
+{
+    total = 0;
+    i = 1;
+    m = n + 1;
+    do {
+        total = total + i;
+        i = i + 1;
+    } while(i < m);
+}
+end
+'''
+
+
+# Time per iteration of a counted loop with for against do-while
+def run_for_suite(args):
+    pipeline = Pipeline()
+    programs = {'for': Program(*pipeline.parse(FOR_PROGRAM)),
+                'do_while': Program(*pipeline.parse(DO_WHILE_PROGRAM))}
+    results = {}
+    for iterations in args.iterations:
+        samples = {name: [] for name in programs}
+        quads_per_iteration = {}
+        for _ in range(args.repeat):
+            for name, program in programs.items():
+                vm = program.instance()
+                vm.set_variable('n', iterations)
+                start = time.perf_counter()
+                vm.execute()
+                samples[name].append((time.perf_counter() - start) / iterations)
+                quads_per_iteration[name] = vm.executed / iterations
+        results[f'iterations-{iterations}'] = {
+            'quads_per_iteration': quads_per_iteration,
+            'phases': {name: summarize(values) for name, values in samples.items()},
+        }
+        print(f'iterations-{iterations:<10} for {min(samples["for"]) * 1e9:8.1f}ns/iteration  '
+              f'do_while {min(samples["do_while"]) * 1e9:8.1f}ns/iteration  '
+              f'quads {quads_per_iteration["for"]:.1f} vs {quads_per_iteration["do_while"]:.1f}')
+    return results
+
+
+# Temps are the int, float and bool cells that do not belong to a variable
+def count_temps(program):
+    layout = program.segment_layout()
+    cells = sum(layout[name][1] - layout[name][0] for name in ('int', 'float', 'bool'))
+    return cells - len(program.var_table)
+
+
+# Quadruples, temps and executed instructions with and without assignments
+# retargeted to the variable, compiled from the same sources
+def run_assign_suite(args):
+    results = {}
+    for name, source, runnable in load_workloads(args.size, 0):
+        counts = {}
+        for mode, retarget in (('copy', False), ('retarget', True)):
+            quads, var_table, cte_table = [], {}, {}
+            parser = PatitoParser(quads=quads, var_table=var_table, cte_table=cte_table,
+                                  retarget_assignments=retarget)
+            parser.parse(source, lexer=PatitoLexer())
+            program = Program(quads, var_table, cte_table)
+            summary = program.instance(io.StringIO()).execute()
+            counts[mode] = {
+                'quads': len(quads),
+                'temps': count_temps(program),
+                'executed': summary['instructions'],
+            }
+        results[name] = counts
+        copy, retarget = counts['copy'], counts['retarget']
+        print(f'{name:<22} quads {copy["quads"]:6} -> {retarget["quads"]:6}  '
+              f'temps {copy["temps"]:5} -> {retarget["temps"]:5}  '
+              f'executed {copy["executed"]:9} -> {retarget["executed"]:9}')
+    return results
+
+
+# Write the generated units of the link suite, main imports all of them.
+# Generated programs use the same variable names, each unit gets its own.
+def write_units(directory, modules, size, changed = None):
+    for k in range(modules):
+        seed = k + 1000 if k == changed else k
+        source = re.sub(r'\b([a-z]+[0-9]+)\b', rf'\1m{k}', generate_program('mixed', size, seed=seed))
+        with open(os.path.join(directory, f'Module{k}.txt'), 'w') as file:
+            file.write(source)
+    imports = ''.join(f'import Module{k};\n' for k in range(modules))
+    with open(os.path.join(directory, 'Main.txt'), 'w') as file:
+        file.write(f'program Main;\n\n{imports}\n{{\n}}\nend\n')
+
+
+# Link time with every unit compiled, every unit cached and one unit changed
+def run_link_suite(args):
+    results = {}
+    modules = args.modules
+    samples = {'cold': [], 'warm': [], 'one_changed': []}
+    compiled = {}
+    for _ in range(args.repeat):
+        with tempfile.TemporaryDirectory() as directory:
+            write_units(directory, modules, args.size)
+            path = os.path.join(directory, 'Main.txt')
+            for phase in ('cold', 'warm', 'one_changed'):
+                if phase == 'one_changed':
+                    write_units(directory, modules, args.size, changed=0)
+                linker = Linker()
+                start = time.perf_counter()
+                linker.link(path)
+                samples[phase].append(time.perf_counter() - start)
+                compiled[phase] = len(linker.compiled)
+    results[f'modules-{modules}'] = {
+        'compiled': compiled,
+        'phases': {phase: summarize(values) for phase, values in samples.items()},
+    }
+    print(f'modules-{modules:<6} ' + '  '.join(
+        f'{phase} {min(values) * 1000:8.2f}ms ({compiled[phase]} compiled)'
+        for phase, values in samples.items()))
+    return results
+
+
+# Benchmark suites, selected with --suite
+SUITES = {
+    'pipeline': run_pipeline_suite,
+    'lexer': run_lexer_suite,
+    'declarations': run_declarations_suite,
+    'disassembler': run_disassembler_suite,
+    'checkpoint': run_checkpoint_suite,
+    'int64': run_int64_suite,
+    'startup': run_startup_suite,
+    'input': run_input_suite,
+    'lanes': run_lanes_suite,
+    'for': run_for_suite,
+    'assign': run_assign_suite,
+    'link': run_link_suite,
+}
+
+
+#####################################################
+# Reporting
+#####################################################
+def print_result(name, result):
+    phases = '  '.join(f'{phase} {values["best"] * 1000:9.3f}ms'
+                       for phase, values in result['phases'].items())
+    print(f'{name:<22} {phases}')
+
+
+def compare(old_report, new_report):
+    regressions = 0
+    print(f'\n{"workload":<22} {"phase":<16} {"old":>11} {"new":>11} {"ratio":>7}')
+    for suite, results in new_report['suites'].items():
+        old_results = old_report.get('suites', {}).get(suite, {})
+        for name, result in results.items():
+            if name not in old_results:
+                continue
+            for phase, values in result.get('phases', {}).items():
+                old_values = old_results[name].get('phases', {}).get(phase)
+                if not old_values or old_values['best'] == 0:
+                    continue
+                ratio = values['best'] / old_values['best']
+                flag = ''
+                if ratio > REGRESSION_THRESHOLD:
+                    flag = '  REGRESSION'
+                    regressions += 1
+                print(f'{name:<22} {phase:<16} {old_values["best"] * 1000:9.3f}ms '
+                      f'{values["best"] * 1000:9.3f}ms {ratio:6.2f}x{flag}')
+    return regressions
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark the 'Patito' lexer, parser and VM.")
+    arg_parser.add_argument('--suite', action='append', choices=sorted(SUITES),
+                            help='suite to run, may be repeated (default: pipeline)')
+    arg_parser.add_argument('--size', type=int, default=100, help='size of generated programs')
+    arg_parser.add_argument('--large-size', type=int, default=20000,
+                            help='variables in the parse-only workload (0 to skip)')
+    arg_parser.add_argument('--lexer-size', type=int, default=20000,
+                            help='size of the generated program for the lexer suite')
+    arg_parser.add_argument('--declarations', type=int, nargs='+', default=[1000, 10000, 50000],
+                            help='variable counts for the declarations suite')
+    arg_parser.add_argument('--quad-count', type=int, default=1000000,
+                            help='quadruples dumped by the disassembler suite')
+    arg_parser.add_argument('--checkpoint-cells', type=int, nargs='+', default=[1000, 100000, 1000000],
+                            help='memory sizes for the checkpoint suite')
+    arg_parser.add_argument('--instances', type=int, default=10000,
+                            help='instances created per sample by the startup suite')
+    arg_parser.add_argument('--input-values', type=int, nargs='+', default=[1000, 100000, 1000000],
+                            help='values read with cin by the input suite')
+    arg_parser.add_argument('--lanes', type=int, nargs='+', default=[100, 1000, 10000],
+                            help='input sets run by the lanes suite')
+    arg_parser.add_argument('--iterations', type=int, nargs='+', default=[1000, 1000000],
+                            help='loop iterations for the for suite')
+    arg_parser.add_argument('--modules', type=int, default=20,
+                            help='generated units imported by the program of the link suite')
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    arg_parser.add_argument('--output', help='write results as JSON to this file')
+    arg_parser.add_argument('--compare', help='JSON results of a previous run to compare with')
+    args = arg_parser.parse_args()
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'size': args.size,
+        'repeat': args.repeat,
+        'suites': {},
+    }
+    for suite in args.suite or ['pipeline']:
+        print(f'-- {suite.upper()} --')
+        report['suites'][suite] = SUITES[suite](args)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    if args.compare:
+        with open(args.compare, 'r') as file:
+            regressions = compare(json.load(file), report)
+        print(f'\n{regressions} regression(s) above {REGRESSION_THRESHOLD:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
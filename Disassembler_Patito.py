@@ -0,0 +1,187 @@
+# Disassembler for the intermediate code of 'Patito' programs.
+#
+# Streams the quadruples, variables table and constants table to text,
+# JSON Lines or CSV without modifying them. Quadruples can be annotated with
+# the quadruples that jump to them and with the source line they came from.
+#
+# Usage:
+#   python Disassembler_Patito.py main_VM.txt
+#   python Disassembler_Patito.py main_VM.txt --format jsonl -o main_VM.jsonl
+import argparse
+import csv
+import json
+import sys
+
+from Opcodes_Patito import JUMP_OPERATORS
+
+FORMATS = ('text', 'jsonl', 'csv')
+CSV_COLUMNS = ['kind', 'index', 'operator', 'left', 'right', 'result',
+               'jumped_from', 'line', 'name', 'type', 'memory_dir', 'value']
+
+
+# Map each jump destination to the quadruples that jump there
+def jump_sources(quads):
+    sources = {}
+    for i, quad in enumerate(quads):
+        if quad[0] in JUMP_OPERATORS and quad[3] is not None:
+            sources.setdefault(quad[3], []).append(i)
+    return sources
+
+
+def json_value(value):
+    if value is None:
+        return 'null'
+    return str(value)
+
+
+#####################################################
+# Text
+#####################################################
+# Linked constants tables may keep the constant in a 'value' entry instead of the key
+def write_table_text(out, title, index_name, table):
+    if len(table) == 0:
+        return
+    names = [str(entry.get('value', key)) for key, entry in table.items()]
+    width = max(len(index_name), max(map(len, names)))
+    out.write(f'-- {title} --\n')
+    out.write(f'{index_name:<{width}}  {"type":<6}  memory_dir\n')
+    for name, entry in zip(names, table.values()):
+        out.write(f'{name:<{width}}  {str(entry["type"]):<6}  {entry["memory_dir"]}\n')
+    out.write('\n')
+
+
+def write_quads_text(out, quads, annotate_jumps = False, quad_lines = None, source_lines = None):
+    out.write('-- QUADRUPLES GENERATED --\n')
+    if not annotate_jumps and quad_lines is None:
+        # Fast path, nothing to add to each line
+        out.writelines(f'{i} {quad}\n' for i, quad in enumerate(quads))
+        return
+    sources = jump_sources(quads) if annotate_jumps else {}
+    for i, quad in enumerate(quads):
+        notes = []
+        if i in sources:
+            notes.append('<- ' + ', '.join(map(str, sources[i])))
+        if quad_lines is not None and i < len(quad_lines):
+            line = quad_lines[i]
+            if source_lines is not None and 0 < line <= len(source_lines):
+                notes.append(f'line {line}: {source_lines[line - 1].strip()}')
+            else:
+                notes.append(f'line {line}')
+        if notes:
+            out.write(f'{i} {quad}  ; {"  ".join(notes)}\n')
+        else:
+            out.write(f'{i} {quad}\n')
+    # Jumps to the end of the program land after the last quadruple
+    if len(quads) in sources:
+        out.write(f'{len(quads)} end  ; <- {", ".join(map(str, sources[len(quads)]))}\n')
+
+
+#####################################################
+# JSON Lines
+#####################################################
+def write_tables_jsonl(out, var_table, cte_table):
+    for name, entry in var_table.items():
+        out.write(json.dumps({'kind': 'variable', 'name': name, 'type': entry['type'],
+                              'memory_dir': entry['memory_dir']}) + '\n')
+    for value, entry in cte_table.items():
+        out.write(json.dumps({'kind': 'constant', 'value': entry.get('value', value), 'type': entry['type'],
+                              'memory_dir': entry['memory_dir']}) + '\n')
+
+
+def write_quads_jsonl(out, quads, annotate_jumps = False, quad_lines = None):
+    sources = jump_sources(quads) if annotate_jumps else {}
+    for i, (operator, left, right, result) in enumerate(quads):
+        # Operands are always ints or None, formatted without json.dumps for speed
+        record = (f'{{"kind": "quad", "index": {i}, "operator": {json.dumps(operator)}, '
+                  f'"left": {json_value(left)}, "right": {json_value(right)}, '
+                  f'"result": {json_value(result)}')
+        if annotate_jumps:
+            record += f', "jumped_from": {sources.get(i, [])}'
+        if quad_lines is not None and i < len(quad_lines):
+            record += f', "line": {quad_lines[i]}'
+        out.write(record + '}\n')
+
+
+#####################################################
+# CSV
+#####################################################
+def write_tables_csv(writer, var_table, cte_table):
+    writer.writerows(['variable', '', '', '', '', '', '', '', name, entry['type'], entry['memory_dir'], '']
+                     for name, entry in var_table.items())
+    writer.writerows(['constant', '', '', '', '', '', '', '', '', entry['type'], entry['memory_dir'],
+                      entry.get('value', value)]
+                     for value, entry in cte_table.items())
+
+
+def write_quads_csv(writer, quads, annotate_jumps = False, quad_lines = None):
+    sources = jump_sources(quads) if annotate_jumps else {}
+    has_lines = quad_lines is not None
+    writer.writerows(
+        ['quad', i, operator, left, right, result,
+         ' '.join(map(str, sources.get(i, ()))),
+         quad_lines[i] if has_lines and i < len(quad_lines) else '',
+         '', '', '', '']
+        for i, (operator, left, right, result) in enumerate(quads))
+
+
+#####################################################
+# Disassembler
+#####################################################
+def disassemble(quads, var_table, cte_table, out = None, format = 'text',
+                annotate_jumps = False, quad_lines = None, source_lines = None,
+                tables = True):
+    if out is None:
+        out = sys.stdout
+    if format == 'text':
+        if tables:
+            write_table_text(out, 'VARIABLES TABLE', 'Variable', var_table)
+            write_table_text(out, 'CONSTANTS TABLE', 'Constant', cte_table)
+        write_quads_text(out, quads, annotate_jumps, quad_lines, source_lines)
+    elif format == 'jsonl':
+        if tables:
+            write_tables_jsonl(out, var_table, cte_table)
+        write_quads_jsonl(out, quads, annotate_jumps, quad_lines)
+    elif format == 'csv':
+        writer = csv.writer(out, lineterminator='\n')
+        writer.writerow(CSV_COLUMNS)
+        if tables:
+            write_tables_csv(writer, var_table, cte_table)
+        write_quads_csv(writer, quads, annotate_jumps, quad_lines)
+    else:
+        raise ValueError(f'Unknown format {format}, expected one of {FORMATS}')
+
+
+def main():
+    # Imported here, the parser itself uses this module to print intermediate code
+    from Scanner_Parser_Patito import PatitoLexer, PatitoParser
+
+    arg_parser = argparse.ArgumentParser(description="Disassemble the intermediate code of a 'Patito' program.")
+    arg_parser.add_argument('file', help="'Patito' source file")
+    arg_parser.add_argument('--format', choices=FORMATS, default='text')
+    arg_parser.add_argument('--no-annotate', dest='annotate', action='store_false',
+                            help='do not annotate jump targets and source lines')
+    arg_parser.add_argument('--no-tables', dest='tables', action='store_false',
+                            help='only write the quadruples')
+    arg_parser.add_argument('-o', '--output', help='write to file instead of stdout')
+    args = arg_parser.parse_args()
+
+    with open(args.file, 'r') as file:
+        data = file.read()
+    quads, var_table, cte_table, quad_lines = [], {}, {}, []
+    parser = PatitoParser(quads=quads, var_table=var_table, cte_table=cte_table, quad_lines=quad_lines)
+    parser.parse(data, lexer=PatitoLexer())
+
+    source_lines = data.splitlines() if args.annotate else None
+    if not args.annotate:
+        quad_lines = None
+    out = open(args.output, 'w', newline='') if args.output else sys.stdout
+    try:
+        disassemble(quads, var_table, cte_table, out, args.format,
+                    args.annotate, quad_lines, source_lines, args.tables)
+    finally:
+        if args.output:
+            out.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,266 @@
+# Synthetic 'Patito' program generator used by the benchmarks.
+#
+# Programs are valid and runnable: every variable is initialized before the
+# body uses it, expressions only read variables that never change (so values
+# stay small), and every loop has its own counter.
+#
+# Usage:
+#   python Generator_Patito.py --shape loops --size 200 -o loops.txt
+import argparse
+import random
+
+# Each memory segment used by the parser holds this many addresses
+SEGMENT_SIZE = 1000
+
+# Preset shapes, each one stressing a different part of the pipeline.
+# 'size' scales the number of statements (and variables for 'variables').
+SHAPES = {
+    'variables': {'variables': 1.0, 'statements': 0.5, 'expression_depth': 1,
+                  'nesting': 0, 'loop_iterations': 1, 'prints': 0.0},
+    'expressions': {'variables': 0.1, 'statements': 0.1, 'expression_depth': 5,
+                    'nesting': 0, 'loop_iterations': 1, 'prints': 0.0},
+    'conditions': {'variables': 0.1, 'statements': 0.3, 'expression_depth': 1,
+                   'nesting': 3, 'loop_iterations': 1, 'prints': 0.1},
+    'loops': {'variables': 0.1, 'statements': 0.2, 'expression_depth': 2,
+              'nesting': 2, 'loop_iterations': 200, 'prints': 0.0},
+    'prints': {'variables': 0.1, 'statements': 0.5, 'expression_depth': 1,
+               'nesting': 1, 'loop_iterations': 20, 'prints': 1.0},
+    'mixed': {'variables': 0.2, 'statements': 0.5, 'expression_depth': 2,
+              'nesting': 2, 'loop_iterations': 10, 'prints': 0.2},
+}
+
+
+class Program_Generator:
+    def __init__(self, variables = 10, statements = 50, expression_depth = 3, nesting = 2,
+                 loop_iterations = 10, prints = 0.2, seed = 0, group_size = 10,
+                 check_memory = True):
+        self.random = random.Random(seed)
+        self.statements = max(1, statements)
+        self.expression_depth = max(0, expression_depth)
+        self.nesting = max(0, nesting)
+        self.loop_iterations = max(1, loop_iterations)
+        self.prints = prints
+        self.group_size = max(1, group_size)
+        self.check_memory = check_memory
+        # Read-only variables used by expressions and variables written by statements
+        half = max(1, variables // 2)
+        self.int_sources = [f'a{i}' for i in range(half)]
+        self.float_sources = [f'f{i}' for i in range(max(1, half // 2))]
+        self.int_sinks = [f'x{i}' for i in range(max(1, variables - half))]
+        self.float_sinks = [f'y{i}' for i in range(max(1, (variables - half) // 2))]
+        self.counters = [f'c{i}' for i in range(self.nesting + 1)]
+        self.strings = [f'out {i} ' for i in range(10)]
+        # Addresses the parser will need per segment, to stay inside SEGMENT_SIZE
+        self.used = {'int': 0, 'float': 0, 'bool': 0}
+        self.constants = {'int': set(), 'float': set(), 'string': set()}
+        self.used['int'] += len(self.int_sources) + len(self.int_sinks) + len(self.counters)
+        self.used['float'] += len(self.float_sources) + len(self.float_sinks)
+
+    def temp(self, var_type):
+        self.used[var_type] += 1
+
+    def constant(self, var_type, value):
+        self.constants[var_type].add(value)
+        return value
+
+    # Constant or variable, optionally negated
+    def leaf(self, var_type, allow_sign = True):
+        choice = self.random.random()
+        if var_type == 'int':
+            if choice < 0.5:
+                text = self.random.choice(self.int_sources)
+            else:
+                text = str(self.constant('int', self.random.randint(1, 9)))
+        else:
+            if choice < 0.5:
+                text = self.random.choice(self.float_sources)
+            else:
+                # Never a whole number, 2.0 would share the int constant 2
+                text = str(self.constant('float', self.random.randint(0, 9) + 0.5))
+        if allow_sign and self.random.random() < 0.1:
+            self.temp(var_type)
+            return '-' + text
+        return text
+
+    # Constant never equal to zero, used as divisor and multiplier
+    def constant_leaf(self, var_type):
+        if var_type == 'int':
+            return str(self.constant('int', self.random.randint(2, 5)))
+        return str(self.constant('float', self.random.randint(1, 4) + 0.5))
+
+    # Expression whose value has exactly the requested type
+    def expression(self, var_type, depth):
+        if depth <= 0:
+            return self.leaf(var_type)
+        if var_type == 'int':
+            operator = self.random.choice(['+', '-', '*'])
+        else:
+            operator = self.random.choice(['+', '-', '*', '/'])
+        left = self.expression(var_type, depth - 1)
+        if operator in ('*', '/'):
+            # Multiplying only by constants keeps values from growing too fast
+            right = self.constant_leaf(self.random.choice(['int', var_type]))
+        else:
+            right = self.expression(self.random.choice(['int', var_type]), depth - 1)
+        self.temp(var_type)
+        return f'({left} {operator} {right})'
+
+    def condition(self):
+        operator = self.random.choice(['<', '>', '!='])
+        left = self.expression('int', min(1, self.expression_depth))
+        right = self.expression(self.random.choice(['int', 'float']), 0)
+        self.temp('bool')
+        return f'{left} {operator} {right}'
+
+    def assign(self, indent):
+        if self.random.random() < 0.7:
+            target = self.random.choice(self.int_sinks)
+            value = self.expression('int', self.expression_depth)
+        else:
+            target = self.random.choice(self.float_sinks)
+            value = self.expression('float', self.expression_depth)
+        return [f'{indent}{target} = {value};']
+
+    def cout(self, indent):
+        items = []
+        for _ in range(self.random.randint(1, 4)):
+            choice = self.random.random()
+            if choice < 0.4:
+                text = self.random.choice(self.strings)
+                self.constants['string'].add(text)
+                items.append(f'"{text}"')
+            elif choice < 0.8:
+                items.append(self.random.choice(self.int_sinks + self.float_sinks))
+            else:
+                items.append(self.expression('int', 1))
+        return [f'{indent}cout({", ".join(items)});']
+
+    def if_statement(self, indent, level):
+        inner = indent + '    '
+        lines = [f'{indent}if({self.condition()}){{']
+        lines += self.block(inner, level + 1, 2)
+        kind = self.random.random()
+        if kind < 0.4:
+            lines.append(f'{indent}}}')
+            lines.append(f'{indent}elif({self.condition()}){{')
+            lines += self.block(inner, level + 1, 2)
+            lines.append(f'{indent}}}')
+            lines.append(f'{indent}else{{')
+            lines += self.block(inner, level + 1, 2)
+        elif kind < 0.7:
+            lines.append(f'{indent}}}')
+            lines.append(f'{indent}else{{')
+            lines += self.block(inner, level + 1, 2)
+        lines.append(f'{indent}}};')
+        return lines
+
+    def loop(self, indent, level):
+        counter = self.counters[level]
+        limit = self.constant('int', self.loop_iterations)
+        inner = indent + '    '
+        lines = [f'{indent}{counter} = 0;', f'{indent}do{{']
+        lines += self.block(inner, level + 1, 3)
+        lines.append(f'{inner}{counter} = {counter} + 1;')
+        lines.append(f'{indent}}} while({counter} < {limit});')
+        self.constant('int', 0)
+        self.constant('int', 1)
+        self.temp('int')
+        self.temp('bool')
+        return lines
+
+    def statement(self, indent, level):
+        choice = self.random.random()
+        if choice < self.prints:
+            return self.cout(indent)
+        if level < self.nesting and choice < self.prints + 0.3:
+            if self.random.random() < 0.5 and self.loop_iterations > 1:
+                return self.loop(indent, level)
+            return self.if_statement(indent, level)
+        return self.assign(indent)
+
+    def block(self, indent, level, count):
+        lines = []
+        for _ in range(count):
+            lines += self.statement(indent, level)
+        return lines
+
+    def declarations(self):
+        lines = []
+        groups = [(self.int_sources + self.int_sinks + self.counters, 'int'),
+                  (self.float_sources + self.float_sinks, 'float')]
+        for names, var_type in groups:
+            for i in range(0, len(names), self.group_size):
+                lines.append(f'{", ".join(names[i:i + self.group_size])}: {var_type};')
+        lines[0] = 'var ' + lines[0]
+        return lines
+
+    def initialization(self, indent):
+        lines = []
+        for i, name in enumerate(self.int_sources):
+            lines.append(f'{indent}{name} = {self.constant("int", i % 9 + 1)};')
+        for i, name in enumerate(self.float_sources):
+            lines.append(f'{indent}{name} = {self.constant("float", i % 9 + 0.5)};')
+        for name in self.int_sinks + self.counters:
+            lines.append(f'{indent}{name} = {self.constant("int", 0)};')
+        for name in self.float_sinks:
+            lines.append(f'{indent}{name} = {self.constant("float", 0.5)};')
+        return lines
+
+    def check(self):
+        for segment, used in list(self.used.items()) + [
+                (f'{t} constants', len(v)) for t, v in self.constants.items()]:
+            if used > SEGMENT_SIZE:
+                raise ValueError(f'Generated program needs {used} {segment} addresses, '
+                                 f'more than the {SEGMENT_SIZE} available per segment. '
+                                 'Lower the size or pass check_memory=False to only parse it.')
+
+    def generate(self, name = 'Generated'):
+        indent = '    '
+        body = self.initialization(indent)
+        body += self.block(indent, 0, self.statements)
+        if self.check_memory:
+            self.check()
+        lines = [f'program {name};', '']
+        lines += self.declarations()
+        lines += ['', '{'] + body + ['}', 'end', '']
+        return '\n'.join(lines)
+
+
+# Build a program from one of the SHAPES scaled to 'size'
+def generate_program(shape = 'mixed', size = 100, seed = 0, check_memory = True, **overrides):
+    if shape not in SHAPES:
+        raise ValueError(f'Unknown shape {shape}, expected one of {sorted(SHAPES)}')
+    preset = SHAPES[shape]
+    options = {
+        'variables': max(2, int(size * preset['variables'])),
+        'statements': max(1, int(size * preset['statements'])),
+        'expression_depth': preset['expression_depth'],
+        'nesting': preset['nesting'],
+        'loop_iterations': preset['loop_iterations'],
+        'prints': preset['prints'],
+    }
+    options.update(overrides)
+    generator = Program_Generator(seed=seed, check_memory=check_memory, **options)
+    return generator.generate(name=shape.capitalize())
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Generate synthetic 'Patito' programs.")
+    arg_parser.add_argument('--shape', choices=sorted(SHAPES), default='mixed')
+    arg_parser.add_argument('--size', type=int, default=100)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--no-check-memory', dest='check_memory', action='store_false',
+                            help='allow programs that overflow memory segments (parse only)')
+    arg_parser.add_argument('-o', '--output', help='write to file instead of stdout')
+    args = arg_parser.parse_args()
+
+    source = generate_program(args.shape, args.size, args.seed, args.check_memory)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(source)
+    else:
+        print(source, end='')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,298 @@
+# Separate compilation and linking of 'Patito' units.
+#
+# A unit is a normal program that can import others before its variables:
+#   program Report;
+#   import Squares;
+#   var total: int;
+#   { ... }
+#   end
+# `import Squares;` compiles Squares.txt (looked up next to the importing file,
+# then in the search path) and makes its variables visible. Each unit compiles
+# with a fresh lexer and parser to an object file in __patitocache__ with its
+# quadruples, constants and variables at unit-local memory directions.
+#
+# An object file is reused while its source is unchanged and the variables of
+# its imports (their interface) are the same, so changing the body of one
+# unit only recompiles that unit.
+#
+# The linker puts the code of every unit before the code of its importers,
+# each unit once, shares variables by name, merges constants of the same type
+# and value and moves temps and jumps by an offset. Temps of different units
+# share cells. A variable name is defined by only one unit, units that do not
+# import each other cannot both declare it.
+#
+# A float constant equal to an int one (1.0 and 1) gets the key (type, value) in
+# the linked constants table, with the constant in its 'value' entry.
+#
+# Usage:
+#   python Linker_Patito.py program.txt          links, runs and lists compiled units
+#   quads, var_table, cte_table = Linker().link('program.txt')
+import argparse
+import hashlib
+import io
+import json
+import os
+from contextlib import redirect_stdout
+
+import ply.yacc as yacc
+
+from Opcodes_Patito import JUMP_OPERATORS
+from Scanner_Parser_Patito import PatitoLexer, PatitoParser
+
+OBJECT_FORMAT = 2
+CACHE_DIR = '__patitocache__'
+SOURCE_EXTENSION = '.txt'
+SEGMENT_SIZE = 1000
+# First memory direction of the constants of each type
+CTE_BASES = {'int': 0, 'float': 1000, 'string': 2000}
+CTE_LIMIT = 3000
+# First memory direction -> name of the segments of variables and temps
+SEGMENTS = {3000: 'int', 4000: 'float', 5000: 'bool'}
+
+
+def sha256(text):
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+# First memory direction of the segment of a memory direction
+def segment_base(memory_dir):
+    return memory_dir - memory_dir % SEGMENT_SIZE
+
+
+class Linker:
+    def __init__(self, search_path = None, cache_dir = None, use_cache = True):
+        self.search_path = list(search_path or [])
+        # None keeps object files in __patitocache__ next to each source
+        self.cache_dir = cache_dir
+        self.use_cache = use_cache
+        # Objects loaded in this session by source path
+        self.objects = {}
+        # Units compiled and units loaded from their object file
+        self.compiled = []
+        self.cached = []
+
+    #####################################################
+    # Object files
+    #####################################################
+    def find_unit(self, name, importer_dir):
+        for directory in [importer_dir] + self.search_path:
+            path = os.path.join(directory, name + SOURCE_EXTENSION)
+            if os.path.exists(path):
+                return os.path.abspath(path)
+        raise FileNotFoundError(f'Cannot find unit {name}{SOURCE_EXTENSION}')
+
+    def object_path(self, path):
+        directory = self.cache_dir or os.path.join(os.path.dirname(path), CACHE_DIR)
+        stem = os.path.splitext(os.path.basename(path))[0]
+        # Same file names in different directories get different objects
+        return os.path.join(directory, f'{stem}-{sha256(path)[:12]}.json')
+
+    def read_object(self, path):
+        try:
+            with open(self.object_path(path), 'r') as file:
+                unit = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if unit.get('format') != OBJECT_FORMAT:
+            return None
+        return unit
+
+    def write_object(self, path, unit):
+        object_path = self.object_path(path)
+        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+        temp_path = object_path + '.tmp'
+        with open(temp_path, 'w') as file:
+            json.dump(unit, file)
+        os.replace(temp_path, object_path)
+
+    # Object of a unit, compiled again only when it is out of date
+    def load(self, path, loading = ()):
+        path = os.path.abspath(path)
+        if path in self.objects:
+            return self.objects[path]
+        if path in loading:
+            raise ValueError(f'Circular import of {path}')
+        loading = loading + (path,)
+        with open(path, 'r') as file:
+            source = file.read()
+        unit = self.read_object(path) if self.use_cache else None
+        if unit is not None and not self.up_to_date(unit, path, source, loading):
+            unit = None
+        if unit is None:
+            unit = self.compile_unit(path, source, loading)
+            self.compiled.append(unit['name'])
+            if self.use_cache:
+                self.write_object(path, unit)
+        else:
+            self.cached.append(unit['name'])
+        self.objects[path] = unit
+        return unit
+
+    def up_to_date(self, unit, path, source, loading):
+        if unit['source_hash'] != sha256(source):
+            return False
+        for entry in unit['imports']:
+            dependency = self.load(self.find_unit(entry['name'], os.path.dirname(path)), loading)
+            if dependency['interface_hash'] != entry['interface_hash']:
+                return False
+        return True
+
+    # Compile one unit with its own lexer and parser, imports are loaded on the way
+    def compile_unit(self, path, source, loading):
+        quads, var_table, cte_table = [], {}, {}
+        imports = []
+        # Unit that defines each imported variable, the rest are defined by this unit
+        owners = {}
+        name = os.path.splitext(os.path.basename(path))[0]
+
+        def resolve_import(unit_name):
+            dependency = self.load(self.find_unit(unit_name, os.path.dirname(path)), loading)
+            imports.append({'name': unit_name, 'interface_hash': dependency['interface_hash']})
+            for var_id, var_type, owner in dependency['exports']:
+                owners.setdefault(var_id, owner)
+            return dependency['exports']
+
+        parser = PatitoParser(quads=quads, var_table=var_table, cte_table=cte_table,
+                              resolve_import=resolve_import)
+        # Parser and lexer report most errors by printing them
+        diagnostics = io.StringIO()
+        try:
+            with redirect_stdout(diagnostics):
+                parser.parse(source, lexer=PatitoLexer())
+        except yacc.YaccError as e:
+            raise ValueError(f'{path} did not compile: {e}') from None
+        if diagnostics.getvalue():
+            raise ValueError(f'{path} did not compile: {diagnostics.getvalue().strip()}')
+        exports = [[var_id, entry['type'], owners.get(var_id, name)] for var_id, entry in var_table.items()]
+        return {
+            'format': OBJECT_FORMAT,
+            'name': name,
+            'source_hash': sha256(source),
+            'interface_hash': sha256(json.dumps(exports)),
+            'imports': imports,
+            'exports': exports,
+            'variables': [[var_id, entry['type'], entry['memory_dir'], owners.get(var_id, name)]
+                          for var_id, entry in var_table.items()],
+            'constants': [[value, entry['type'], entry['memory_dir']] for value, entry in cte_table.items()],
+            'quads': [list(quad) for quad in quads],
+        }
+
+    #####################################################
+    # Linking
+    #####################################################
+    # Units in execution order, every import before its importer
+    def link_order(self, path):
+        order = []
+        seen = set()
+
+        def visit(unit_path):
+            if unit_path in seen:
+                return
+            seen.add(unit_path)
+            unit = self.load(unit_path)
+            for entry in unit['imports']:
+                visit(self.find_unit(entry['name'], os.path.dirname(unit_path)))
+            order.append(unit)
+
+        visit(os.path.abspath(path))
+        return order
+
+    def link(self, path):
+        units = self.link_order(path)
+        var_table = {}
+        owners = {}
+        cte_table = {}
+        # (type, value) -> memory direction of the linked constant
+        cte_dirs = {}
+        next_dir = {base: base for base in SEGMENTS}
+        cte_next = dict(CTE_BASES)
+
+        # Variables first, shared by name with the units that import them
+        for unit in units:
+            for name, var_type, memory_dir, owner in unit['variables']:
+                if name in var_table:
+                    if owners[name] != owner:
+                        raise ValueError(f'Variable {name} is defined by both {owners[name]} and {owner}')
+                    continue
+                base = segment_base(memory_dir)
+                var_table[name] = {'type': var_type, 'memory_dir': next_dir[base]}
+                owners[name] = owner
+                next_dir[base] += 1
+
+        quads = []
+        end_dir = dict(next_dir)
+        for unit in units:
+            relocation = {}
+            for name, var_type, memory_dir, owner in unit['variables']:
+                relocation[memory_dir] = var_table[name]['memory_dir']
+            # Constants merged by type and value, 1 and 1.0 keep their own cells
+            for value, cte_type, memory_dir in unit['constants']:
+                if (cte_type, value) not in cte_dirs:
+                    cte_dirs[cte_type, value] = cte_next[cte_type]
+                    if value in cte_table:
+                        cte_table[cte_type, value] = {'type': cte_type, 'memory_dir': cte_next[cte_type],
+                                                      'value': value}
+                    else:
+                        cte_table[value] = {'type': cte_type, 'memory_dir': cte_next[cte_type]}
+                    cte_next[cte_type] += 1
+                relocation[memory_dir] = cte_dirs[cte_type, value]
+            # Temps of the unit come right after its variables in each segment.
+            # A temp is never read after its unit ends, so the temps of every
+            # unit move to the same cells, right after the variables of all units
+            first_temp = {base: base for base in SEGMENTS}
+            for memory_dir in relocation:
+                if memory_dir >= CTE_LIMIT:
+                    first_temp[segment_base(memory_dir)] += 1
+            last_temp = dict(first_temp)
+
+            def relocate(memory_dir):
+                if memory_dir is None or memory_dir in relocation:
+                    return relocation.get(memory_dir)
+                base = segment_base(memory_dir)
+                last_temp[base] = max(last_temp[base], memory_dir + 1)
+                return memory_dir - first_temp[base] + next_dir[base]
+
+            quad_offset = len(quads)
+            for operator, l_operand, r_operand, result in unit['quads']:
+                if operator in JUMP_OPERATORS:
+                    if result is not None:
+                        result += quad_offset
+                else:
+                    result = relocate(result)
+                quads.append((operator, relocate(l_operand), relocate(r_operand), result))
+            for base in SEGMENTS:
+                end_dir[base] = max(end_dir[base], next_dir[base] + last_temp[base] - first_temp[base])
+
+        for base, name in SEGMENTS.items():
+            if end_dir[base] > base + SEGMENT_SIZE:
+                raise ValueError(f'Linked program does not fit in the {name} memory segment')
+        for cte_type, memory_dir in cte_next.items():
+            if memory_dir > CTE_BASES[cte_type] + SEGMENT_SIZE:
+                raise ValueError(f'Linked program does not fit in the cte_{cte_type} memory segment')
+        return quads, var_table, cte_table
+
+
+def main():
+    # Imported here, the Virtual Machine is only needed to run the linked program
+    from Virtual_Machine import Virtual_Machine
+
+    arg_parser = argparse.ArgumentParser(description="Compile, link and run 'Patito' units.")
+    arg_parser.add_argument('file', help="'Patito' program, its imports are compiled as needed")
+    arg_parser.add_argument('-I', '--include', action='append', default=[],
+                            help='directory to search for imported units')
+    arg_parser.add_argument('--no-cache', dest='use_cache', action='store_false',
+                            help='compile every unit and do not write object files')
+    arg_parser.add_argument('--no-run', dest='run', action='store_false',
+                            help='only compile and link')
+    args = arg_parser.parse_args()
+
+    linker = Linker(args.include, use_cache=args.use_cache)
+    quads, var_table, cte_table = linker.link(args.file)
+    print('Compiled:', ', '.join(linker.compiled) or '-')
+    print('From cache:', ', '.join(linker.cached) or '-')
+    if args.run:
+        Virtual_Machine(quads, var_table, cte_table).execute()
+
+
+if __name__ == '__main__':
+    main()
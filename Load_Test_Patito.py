@@ -0,0 +1,95 @@
+# Load test client for Server_Patito.py
+#
+# Sends the same program many times over several concurrent connections and
+# reports latency percentiles and requests per second.
+#
+# Usage:
+#   python Load_Test_Patito.py main_VM.txt --requests 1000 --concurrency 8
+#   python Load_Test_Patito.py test_elseif.txt --unix /tmp/patito.sock
+import argparse
+import asyncio
+import json
+import time
+
+from Server_Patito import DEFAULT_HOST, DEFAULT_PORT, MAX_REQUEST_SIZE
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def open_connection(host, port, unix_path):
+    if unix_path:
+        return await asyncio.open_unix_connection(unix_path, limit=MAX_REQUEST_SIZE)
+    return await asyncio.open_connection(host, port, limit=MAX_REQUEST_SIZE)
+
+
+# One connection sending requests back to back until the shared counter runs out
+async def client(host, port, unix_path, source, max_instructions, counter, latencies, failures):
+    reader, writer = await open_connection(host, port, unix_path)
+    try:
+        while counter[0] > 0:
+            counter[0] -= 1
+            request = {'id': counter[0], 'source': source}
+            if max_instructions:
+                request['max_instructions'] = max_instructions
+            start = time.perf_counter()
+            writer.write(json.dumps(request).encode() + b'\n')
+            await writer.drain()
+            line = await reader.readline()
+            latencies.append((time.perf_counter() - start) * 1000)
+            response = json.loads(line)
+            if not response.get('ok'):
+                failures.append(response.get('errors'))
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def load_test(source, requests, concurrency, host = DEFAULT_HOST, port = DEFAULT_PORT,
+                    unix_path = None, max_instructions = None):
+    counter = [requests]
+    latencies = []
+    failures = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, unix_path, source, max_instructions,
+                                  counter, latencies, failures)
+                           for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'failures': len(failures),
+        'first_failure': failures[0] if failures else None,
+        'concurrency': concurrency,
+        'elapsed_s': elapsed,
+        'requests_per_second': len(latencies) / elapsed if elapsed > 0 else 0.0,
+        'p50_ms': percentile(latencies, 0.50),
+        'p99_ms': percentile(latencies, 0.99),
+        'max_ms': latencies[-1] if latencies else 0.0,
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Measure latency and throughput of the Patito server.')
+    arg_parser.add_argument('file', help="'Patito' source file to send")
+    arg_parser.add_argument('--requests', type=int, default=200)
+    arg_parser.add_argument('--concurrency', type=int, default=4)
+    arg_parser.add_argument('--host', default=DEFAULT_HOST)
+    arg_parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    arg_parser.add_argument('--unix', dest='unix_path')
+    arg_parser.add_argument('--max-instructions', type=int, default=None)
+    args = arg_parser.parse_args()
+
+    with open(args.file, 'r') as file:
+        source = file.read()
+    report = asyncio.run(load_test(source, args.requests, args.concurrency, args.host,
+                                   args.port, args.unix_path, args.max_instructions))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+# Typed opcodes shared by the parser and the Virtual Machine.
+#
+# The parser knows the type of both operands of every operation, so instead
+# of a generic '+' it emits the operator tagged with those types: '+ii'
+# (int + int), '+if' (int + float), ... Unary minus becomes 'negi' or 'negf'
+# and cin 'readi' or 'readf'.
+#
+# The tag is only a label, every opcode of an operator runs the same function
+# of OPERATIONS ('+ii' and '+ff' both run operator.add). It lets the int64
+# mode check only the opcodes that give ints.
+import operator
+
+TYPE_CODES = {
+    'int': 'i',
+    'float': 'f',
+}
+
+# Generic operator -> function applied to the two operand values
+OPERATIONS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    '>': operator.gt,
+    '<': operator.lt,
+    '!=': operator.ne,
+}
+
+# Typed opcode -> (generic operator, left type, right type)
+TYPED_OPCODES = {}
+for _operator in OPERATIONS:
+    for _l_type, _l_code in TYPE_CODES.items():
+        for _r_type, _r_code in TYPE_CODES.items():
+            TYPED_OPCODES[_operator + _l_code + _r_code] = (_operator, _l_type, _r_type)
+
+# Unary minus by operand type
+NEGATE = {
+    'int': 'negi',
+    'float': 'negf',
+}
+
+# Quadruples whose result is the index of the quadruple to jump to.
+# ('Loop', counter, limit, body) adds 1 to counter and jumps to body while counter <= limit.
+JUMP_OPERATORS = frozenset(['Goto', 'GotoF', 'GotoT', 'Loop'])
+
+# Read of an input value by variable type
+READ = {
+    'int': 'readi',
+    'float': 'readf',
+}
+
+
+# Opcode emitted for an operation between values of known types
+def typed_opcode(operator, l_type, r_type):
+    return operator + TYPE_CODES[l_type] + TYPE_CODES[r_type]
+
+# Range of the fixed width integers of the int64 mode of the Virtual Machine
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+INT64_MASK = 2 ** 64 - 1
+OVERFLOW_MODES = ('trap', 'wrap')
+
+# Opcodes whose result is an int and can leave the int64 range.
+# Division always gives a float and comparisons a bool.
+INT64_OPCODES = ('+ii', '-ii', '*ii')
+
+
+# Handler that applies function and keeps the result inside int64.
+# 'trap' raises OverflowError and 'wrap' keeps the low 64 bits as two's complement.
+# With checked_type only results of that type are checked, used for generic operators.
+def int64_handler(function, symbol, overflow = 'trap', checked_type = None):
+    if overflow not in OVERFLOW_MODES:
+        raise ValueError(f'Unknown overflow mode {overflow}, expected one of {OVERFLOW_MODES}')
+
+    def handler(l_value, r_value):
+        value = function(l_value, r_value)
+        if INT64_MIN <= value <= INT64_MAX or (checked_type is not None and type(value) is not checked_type):
+            return value
+        if overflow == 'wrap':
+            return ((value - INT64_MIN) & INT64_MASK) + INT64_MIN
+        if symbol == 'neg':
+            raise OverflowError(f'int64 overflow: -({r_value})')
+        raise OverflowError(f'int64 overflow: {l_value} {symbol} {r_value}')
+    return handler
+
+
+# Fit a value into int64 the way the overflow mode does, used for constants
+def to_int64(value, overflow = 'trap'):
+    if INT64_MIN <= value <= INT64_MAX:
+        return value
+    if overflow == 'wrap':
+        return ((value - INT64_MIN) & INT64_MASK) + INT64_MIN
+    raise OverflowError(f'int64 overflow: constant {value}')
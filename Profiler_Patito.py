@@ -0,0 +1,156 @@
+# Phase-level timing report of the 'Patito' compile-and-run pipeline.
+#
+# Times each phase of one compile and run separately and counts what each
+# phase worked on, so a slow run can be traced to the phase to optimize:
+#   lexer_build      PatitoLexer(), compiles the token regular expressions
+#   parser_build     PatitoParser(), PLY reads parsetab.py and binds the actions
+#   lex              one pass of the lexer over the source, counts the tokens
+#   parse            parsing and semantic actions over the tokens of lex
+#   program_setup    Program tables and handlers
+#   allocate_memory  memory layout of the Program
+#   save_cte         constant image of the Program
+#   decode           quadruples decoded to instructions
+#   instance         new Virtual Machine instance of the Program
+#   execute          run of the instructions
+#
+# Reductions are counted in a second, untimed parse of the same tokens, so
+# the counting does not slow down the timed one.
+#
+# Usage:
+#   python Profiler_Patito.py main_VM.txt
+#   python run_VM.py --profile main_VM.txt
+#   report = profile(source)
+import argparse
+import io
+import json
+import time
+from collections import Counter
+from contextlib import redirect_stdout
+from functools import partial
+
+from Scanner_Parser_Patito import PatitoLexer, PatitoParser
+from Virtual_Machine import Program
+
+PHASES = ('lexer_build', 'parser_build', 'lex', 'parse', 'program_setup', 'allocate_memory',
+          'save_cte', 'decode', 'instance', 'execute')
+# Productions listed in the printed report, by number of reductions
+TOP_PRODUCTIONS = 5
+
+
+# Count the reductions of each production, the parser runs the counting
+# wrapper instead of the semantic action from now on
+def count_reductions(parser):
+    counts = Counter()
+    for production in parser.productions:
+        action = production.callable
+        if action is None:
+            continue
+
+        def counted(p, action = action, name = production.str):
+            counts[name] += 1
+            action(p)
+        production.callable = counted
+    return counts
+
+
+# Compile and run source once, timing every phase.
+# With run=False the report stops after the Program is built.
+def profile(source, int_mode = None, overflow = 'trap', output = None, input = None, run = True):
+    phases = {}
+    counts = {}
+    quads, var_table, cte_table = [], {}, {}
+
+    start = time.perf_counter()
+    lexer = PatitoLexer()
+    phases['lexer_build'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parser = PatitoParser(quads=quads, var_table=var_table, cte_table=cte_table)
+    phases['parser_build'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    lexer.input(source)
+    tokens = list(iter(lexer.token, None))
+    phases['lex'] = time.perf_counter() - start
+    counts['tokens'] = len(tokens)
+
+    # The parser takes the tokens already lexed, no source is given to the lexer
+    start = time.perf_counter()
+    parser.parse(lexer=lexer, tokenfunc=partial(next, iter(tokens), None))
+    phases['parse'] = time.perf_counter() - start
+
+    # Untimed parse into scratch tables, errors were already printed by the first one
+    reductions = count_reductions(parser)
+    parser.reset([], {}, {})
+    with redirect_stdout(io.StringIO()):
+        parser.parse(lexer=lexer, tokenfunc=partial(next, iter(tokens), None))
+    counts['reductions'] = sum(reductions.values())
+    counts['quads'] = len(quads)
+    counts['variables'] = len(var_table)
+    counts['constants'] = len(cte_table)
+
+    program = Program(quads, var_table, cte_table, int_mode, overflow, timings=phases)
+    counts['memory_cells'] = program.end
+
+    if run:
+        start = time.perf_counter()
+        vm = program.instance(output, input)
+        phases['instance'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        summary = vm.execute()
+        phases['execute'] = time.perf_counter() - start
+        counts['instructions'] = summary['instructions']
+        counts['jumps'] = summary['jumps']
+
+    return {
+        'source_bytes': len(source),
+        'phases': phases,
+        'total': sum(phases.values()),
+        'counts': counts,
+        'reductions': dict(reductions.most_common()),
+    }
+
+
+def print_profile(report):
+    lines = ['-- PROFILE --']
+    total = report['total'] or 1
+    for phase in PHASES:
+        if phase in report['phases']:
+            seconds = report['phases'][phase]
+            lines.append(f'{phase:<16} {seconds * 1000:10.3f} ms  {seconds / total * 100:5.1f}%')
+    lines.append(f'{"total":<16} {report["total"] * 1000:10.3f} ms')
+    for name, count in report['counts'].items():
+        lines.append(f'{name:<16} {count}')
+    for production, count in list(report['reductions'].items())[:TOP_PRODUCTIONS]:
+        lines.append(f'{count:>10}  {production}')
+    print('\n'.join(lines))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Time each phase of compiling and running a 'Patito' program.")
+    arg_parser.add_argument('file', help="'Patito' source file")
+    arg_parser.add_argument('--int64', choices=['trap', 'wrap'], default=None,
+                            help='run ints as 64-bit integers, trapping or wrapping on overflow')
+    arg_parser.add_argument('--no-run', dest='run', action='store_false',
+                            help='stop after building the Program')
+    arg_parser.add_argument('--json', action='store_true', help='write the report as JSON')
+    arg_parser.add_argument('--show-output', action='store_true',
+                            help='let the program print, its output is discarded by default')
+    args = arg_parser.parse_args()
+
+    with open(args.file, 'r') as file:
+        source = file.read()
+    output = None if args.show_output else io.StringIO()
+    report = profile(source, 'int64' if args.int64 else None, args.int64 or 'trap',
+                     output=output, run=args.run)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        if args.show_output:
+            print()
+        print_profile(report)
+
+
+if __name__ == '__main__':
+    main()
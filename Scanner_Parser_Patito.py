@@ -1,6 +1,9 @@
 import ply.lex as lex
 import ply.yacc as yacc
-import pandas as pd
+
+from Disassembler_Patito import disassemble
+from Opcodes_Patito import NEGATE, READ, TYPED_OPCODES, typed_opcode
+from Symbol_Table import Symbol_Table
 
 # List of reserved words used by 'Patito' language
 reserved = {
@@ -10,11 +13,15 @@ reserved = {
     'int' : 'INT',
     'float' : 'FLOAT',
     'cout' : 'COUT',
+    'cin' : 'CIN',
     'if' : 'IF',
     'elif': 'ELSEIF',
     'else' : 'ELSE',
     'do' : 'DO',
     'while' : 'WHILE',
+    'for' : 'FOR',
+    'to' : 'TO',
+    'import' : 'IMPORT',
 }
 
 # Tokens from 'Patito' language to be used for the lexer
@@ -112,7 +119,8 @@ def PatitoLexer():
 #####################################################
 # Parser
 #####################################################
-def PatitoParser(print_intermediate_code = False, quads = [], var_table = {}, cte_table = {}):
+def PatitoParser(print_intermediate_code = False, quads = [], var_table = {}, cte_table = {}, quad_lines = None,
+                 retarget_assignments = True, resolve_import = None):
     # Define start of memory for each type
     cont_cte_int = 0
     cont_cte_float = 1000
@@ -121,6 +129,7 @@ def PatitoParser(print_intermediate_code = False, quads = [], var_table = {}, ct
     cont_float = 4000
     cont_bool = 5000
     # Create dictionaries to store memory location and type of each constant and variable
+    symbols = Symbol_Table(var_table)
     
     # Helper to detect change of sign
     change_symbol = False
@@ -128,8 +137,18 @@ def PatitoParser(print_intermediate_code = False, quads = [], var_table = {}, ct
     stack_operands = [] # A, B
     stack_operators = [] # + -
     stack_jumps = []
+    # Counter and limit memory directions of the open for loops
+    stack_for = []
     cont_quads = 0
+    # Source line of the last token seen, saved for each quadruple in quad_lines
+    current_line = 0
+    # Temp written by the last operation quadriple, None once it was retargeted
+    last_temp = None
+    # Unit that defines each imported variable
+    import_owners = {}
     
+    negate_operators = frozenset(NEGATE.values())
+
     # Semantic rules between types operators
     semantics = {
             ('int', 'int', '+'): 'int',
@@ -164,15 +183,45 @@ def PatitoParser(print_intermediate_code = False, quads = [], var_table = {}, ct
     
     # Helper function to add quadriple to queue of intermediate code
     def save_quad(quad, res_type):
-        nonlocal quads, stack_operands, cont_quads
+        nonlocal quads, stack_operands, cont_quads, last_temp
         quads.append(quad)
         cont_quads += 1
+        # Operations always write to a new temp
+        if quad[0] in TYPED_OPCODES or quad[0] in negate_operators:
+            last_temp = quad[3]
+        if quad_lines is not None:
+            quad_lines.append(current_line)
         # if there are no more follow-up operations to perform with generated quad
         if res_type != None:
             memory_dir = quad[3]
             stack_operands.append((memory_dir, res_type))
 
 
+    # Copy a value to a variable. When the value is the temp written by the
+    # last quadriple, that quadriple writes to the variable instead and the
+    # temp is given back.
+    def assign_quad(value_mem, value_type, target_mem):
+        nonlocal last_temp, cont_int, cont_float, cont_bool
+        if (retarget_assignments and value_mem == last_temp and
+            len(quads) > 0 and quads[-1][3] == value_mem):
+            quads[-1] = quads[-1][:3] + (target_mem,)
+            last_temp = None
+            if value_type == 'int' and value_mem == cont_int - 1:
+                cont_int -= 1
+            elif value_type == 'float' and value_mem == cont_float - 1:
+                cont_float -= 1
+            elif value_type == 'bool' and value_mem == cont_bool - 1:
+                cont_bool -= 1
+        else:
+            save_quad(('=', value_mem, None, target_mem), None)
+
+
+    # Remember the line of the terminal reduced by a semantic action
+    def track_line(p):
+        nonlocal current_line
+        current_line = p.lineno(1)
+
+
     # Helper function to build quadriple from operations
     def create_quad():
         r_operand_mem, r_type = stack_operands.pop()
@@ -181,6 +230,8 @@ def PatitoParser(print_intermediate_code = False, quads = [], var_table = {}, ct
         # if valid operation between types
         if (r_type, l_type, operator) in semantics:
             res_type = semantics[(r_type, l_type, operator)]
+            # Emit the operator tagged with both operand types
+            operator = typed_opcode(operator, l_type, r_type)
             if res_type == 'int':
                 nonlocal cont_int
                 quad = (operator, l_operand_mem, r_operand_mem, cont_int)
@@ -203,31 +254,38 @@ def PatitoParser(print_intermediate_code = False, quads = [], var_table = {}, ct
     # Define CFG (Context free Grammars) from Patito Language
     # Actions to perform when all the file is parsed
     def p_program(p):
-        'program : PROGRAM ID SEMICOLON r body END'
+        'program : PROGRAM ID SEMICOLON imports r body END'
         # Detect error if pending operation or quadriple
         if (len(stack_operands) > 0 or 
             len(stack_operators) > 0 or
-            len(stack_jumps) > 0):
+            len(stack_jumps) > 0 or
+            len(stack_for) > 0):
             raise yacc.YaccError('Pending quadruples')
         if print_intermediate_code:
-            # Print variables tables
-            df_var_table = pd.DataFrame.from_dict(var_table, orient='index')
-            df_var_table.index.name = 'Variable'
-            if len(df_var_table) > 0:
-                print('-- VARIABLES TABLE --')
-                print(df_var_table, '\n')
-            # Print constants table
-            df_cte_table = pd.DataFrame.from_dict(cte_table, orient='index')
-            df_cte_table.index.name = 'Constant'
-            if len(df_cte_table) > 0:
-                print('-- CONSTANTS TABLE --')
-                print(df_cte_table, '\n')
-            # Print queue of quadriples, intermediate code
-            print('-- QUADRUPLES GENERATED --')
-            i = 0
-            while len(quads) > 0:
-                print(i, quads.pop(0))
-                i += 1
+            # Print variables and constants tables, and the intermediate code
+            disassemble(quads, var_table, cte_table)
+
+    def p_imports(p):
+        '''imports : import_unit imports
+                   | empty'''
+
+    # Make the variables of another unit visible, they are shared by name when linked.
+    # resolve_import(name) compiles the unit and returns its [(variable, type, defining unit), ...]
+    def p_import_unit(p):
+        'import_unit : IMPORT ID SEMICOLON'
+        track_line(p)
+        unit = p[2]
+        if resolve_import is None:
+            raise yacc.YaccError(f'Cannot import {unit}, imports are compiled by Linker_Patito.py')
+        for var_id, var_type, owner in resolve_import(unit):
+            entry = symbols.lookup(var_id)
+            if entry is None:
+                symbols.define(var_id, var_type, allocate_var(var_type))
+                import_owners[var_id] = owner
+            elif import_owners[var_id] != owner:
+                # Same name in two units that do not import each other
+                raise yacc.YaccError(f'Variable {var_id} imported from {unit} is defined by both '
+                                     f'{import_owners[var_id]} and {owner}.')
 
     def p_r(p):
         '''r : vars
@@ -244,12 +302,7 @@ def PatitoParser(print_intermediate_code = False, quads = [], var_table = {}, ct
         's : ID'
         # Create variable or detect it is duplicated if exists
         var_id = p[1]
-        if var_id not in var_table:
-            var_table[var_id] = {
-                'type': None,
-                'memory_dir': None
-            }
-        else:
+        if not symbols.declare(var_id):
             print('ERROR in line', p.lineno(1), ': Variable {', var_id, '} already exists.')
 
     def p_p(p):
@@ -273,7 +326,9 @@ def PatitoParser(print_intermediate_code = False, quads = [], var_table = {}, ct
         '''statement : assign
                      | condition
                      | cycle
-                     | print'''
+                     | for
+                     | print
+                     | read'''
 
 
     # Create quadriple of variable assignation
@@ -286,23 +341,23 @@ def PatitoParser(print_intermediate_code = False, quads = [], var_table = {}, ct
             operator = stack_operators.pop()
             # Detect if Type mismatch on assignation
             if l_type != r_type:
-                # TODO si operator es '=' se debe asignar resultado a direccion de memoria de operador derecho
                 print('Trying to assign type', r_type, 'to type', l_type, 'in line', p.lineno(2))
             else:
-                quad = (operator, r_operand_mem, None, l_operand_mem)
-                save_quad(quad, None)
+                assign_quad(r_operand_mem, r_type, l_operand_mem)
         else:
             raise yacc.YaccError('Unexpected error trying to assign value to variable')
 
     # Check if variable was decleared and add it to operands
     def p_id_assign(p):
         'id_assign : ID'
+        track_line(p)
         var_id = p[1]
-        if var_id not in var_table:
+        entry = symbols.lookup(var_id)
+        if entry is None:
             raise yacc.YaccError(f'Variable {var_id}, was not declared.')
         else:
-            memory_dir = var_table[var_id]['memory_dir']
-            var_type = var_table[var_id]['type']
+            memory_dir = entry['memory_dir']
+            var_type = entry['type']
             stack_operands.append((memory_dir, var_type))
 
     # Add equal operator to detect assignation
@@ -330,6 +385,7 @@ def PatitoParser(print_intermediate_code = False, quads = [], var_table = {}, ct
     # Completed inner operations from cycle expression
     def p_r_par_cycle(p):
         'r_par_cycle : RIGHTPARENTHESIS'
+        track_line(p)
         # remove '(' from operators stack
         operator = stack_operators.pop()
         if operator != '(':
@@ -345,23 +401,83 @@ def PatitoParser(print_intermediate_code = False, quads = [], var_table = {}, ct
                 quad = ('GotoT', operand_mem, None, jump)
                 save_quad(quad, None)
 
-    # End of If or Else
-    def p_condition(p):
-        'condition : IF left_par_condition expression right_par_condition body ef SEMICOLON'
-        # FILL end of If / else condition
-        fill_quad_jump = stack_jumps.pop()        
+    # Counted loop, the counter goes from the first value to the limit included.
+    # The body ends with one Loop quadriple that increments the counter and
+    # jumps back while it has not passed the limit.
+    def p_for(p):
+        'for : for_id EQUAL expression for_to expression for_start m RIGHTBRACE SEMICOLON'
+        counter_mem, limit_mem = stack_for.pop()
+        # Jump of the initial test, the body starts right after it
+        fill_quad_jump = stack_jumps.pop()
+        quad = ('Loop', counter_mem, limit_mem, fill_quad_jump + 1)
+        save_quad(quad, None)
         op, l_mem, r_mem, jump = quads[fill_quad_jump]
         if jump == None:
             quads[fill_quad_jump] = (op, l_mem, r_mem, cont_quads)
-            if len(stack_jumps) > 0:
-                fill_quad_jump = stack_jumps.pop()        
-                op, l_mem, r_mem, jump = quads[fill_quad_jump]
-                if op == 'Goto' and jump == None:
-                    quads[fill_quad_jump] = (op, l_mem, r_mem, cont_quads)
-                else:
-                    stack_jumps.append(fill_quad_jump)
         else:
-            raise yacc.YaccError('Unexpected error in condition IF.')
+            raise yacc.YaccError('Unexpected error in FOR statement.')
+
+    # Counter of the loop, must be a declared int
+    def p_for_id(p):
+        'for_id : FOR ID'
+        track_line(p)
+        var_id = p[2]
+        entry = symbols.lookup(var_id)
+        if entry is None:
+            raise yacc.YaccError(f'Variable {var_id}, was not declared.')
+        if entry['type'] != 'int':
+            raise yacc.YaccError('Type mismatch in FOR statement, the counter must be int.')
+        stack_for.append((entry['memory_dir'], None))
+        # start limiting the operations of the first value
+        stack_operators.append('for')
+
+    # Assign the first value to the counter
+    def p_for_to(p):
+        'for_to : TO'
+        track_line(p)
+        operator = stack_operators.pop()
+        if operator != 'for':
+            raise yacc.YaccError('Unexpected error in FOR statement.')
+        operand_mem, operand_type = stack_operands.pop()
+        if operand_type != 'int':
+            raise yacc.YaccError('Type mismatch in FOR statement, the first value must be int.')
+        counter_mem, limit_mem = stack_for[-1]
+        assign_quad(operand_mem, operand_type, counter_mem)
+        # start limiting the operations of the limit
+        stack_operators.append('to')
+
+    # Save the limit once and skip the body if the counter already passed it
+    def p_for_start(p):
+        'for_start : LEFTBRACE'
+        nonlocal cont_int, cont_bool
+        track_line(p)
+        operator = stack_operators.pop()
+        if operator != 'to':
+            raise yacc.YaccError('Unexpected error in FOR statement.')
+        operand_mem, operand_type = stack_operands.pop()
+        if operand_type != 'int':
+            raise yacc.YaccError('Type mismatch in FOR statement, the limit must be int.')
+        counter_mem, limit_mem = stack_for.pop()
+        limit_mem = cont_int
+        cont_int += 1
+        save_quad(('=', operand_mem, None, limit_mem), None)
+        stack_for.append((counter_mem, limit_mem))
+        save_quad((typed_opcode('>', 'int', 'int'), counter_mem, limit_mem, cont_bool), None)
+        save_quad(('GotoT', cont_bool, None, None), None)
+        cont_bool += 1
+        stack_jumps.append(cont_quads-1)
+
+    # End of If or Else
+    def p_condition(p):
+        'condition : IF left_par_condition expression right_par_condition body ef SEMICOLON'
+        # FILL end of If / else condition, and the Goto of the elif if there was one
+        for _ in range(p[6]):
+            fill_quad_jump = stack_jumps.pop()
+            op, l_mem, r_mem, jump = quads[fill_quad_jump]
+            if jump == None:
+                quads[fill_quad_jump] = (op, l_mem, r_mem, cont_quads)
+            else:
+                raise yacc.YaccError('Unexpected error in condition IF.')
 
     def p_left_par_condition(p):
         'left_par_condition : LEFTPARENTHESIS'
@@ -372,6 +488,7 @@ def PatitoParser(print_intermediate_code = False, quads = [], var_table = {}, ct
     # Boolean condition, if false jump and skip
     def p_right_par_condition(p):
         'right_par_condition : RIGHTPARENTHESIS'
+        track_line(p)
         # remove '(' from operators stack
         operator = stack_operators.pop()
         if operator != '(':
@@ -386,13 +503,19 @@ def PatitoParser(print_intermediate_code = False, quads = [], var_table = {}, ct
                 save_quad(quad, None)
                 stack_jumps.append(cont_quads-1)
     
+    # Number of jumps left pending for the end of the condition
     def p_ef(p):
         '''ef : empty
               | l
               | elif_ef left_par_ef expression right_par_ef body l'''
+        if len(p) > 2:
+            p[0] = 2
+        else:
+            p[0] = 1
         
     def p_elif_ef(p):
         'elif_ef : ELSEIF'
+        track_line(p)
         # Create GOTO
         quad = ('Goto', None, None, None)
         save_quad(quad, None)
@@ -414,6 +537,7 @@ def PatitoParser(print_intermediate_code = False, quads = [], var_table = {}, ct
     # Boolean condition, if false jump and skip
     def p_right_par_ef(p):
         'right_par_ef : RIGHTPARENTHESIS'
+        track_line(p)
         # remove '(' from operators stack
         operator = stack_operators.pop()
         if operator != '(':
@@ -434,6 +558,7 @@ def PatitoParser(print_intermediate_code = False, quads = [], var_table = {}, ct
     # Quadriple to Jump to end of condition if expression was true
     def p_else_condition(p):
         'else_condition : ELSE'
+        track_line(p)
         quad = ('Goto', None, None, None)
         save_quad(quad, None)
         # Fill jump
@@ -478,6 +603,7 @@ def PatitoParser(print_intermediate_code = False, quads = [], var_table = {}, ct
              | CTE_STRING'''
         # If string
         if p[1] != None:
+            track_line(p)
             if (len(stack_operators) > 0 and 
             stack_operators[-1] == 'cout'):
                 cte_string = p[1]
@@ -511,9 +637,29 @@ def PatitoParser(print_intermediate_code = False, quads = [], var_table = {}, ct
         '''i : empty
              | COMA g'''
 
+    # Read values from the input into variables
+    def p_read(p):
+        'read : CIN LEFTPARENTHESIS read_list RIGHTPARENTHESIS SEMICOLON'
+
+    def p_read_list(p):
+        '''read_list : read_id
+                     | read_id COMA read_list'''
+
+    # Generate quadriple to read a value of the variable's type
+    def p_read_id(p):
+        'read_id : ID'
+        track_line(p)
+        var_id = p[1]
+        entry = symbols.lookup(var_id)
+        if entry is None:
+            raise yacc.YaccError(f'Variable {var_id}, was not declared.')
+        quad = (READ[entry['type']], None, None, entry['memory_dir'])
+        save_quad(quad, None)
+
     # End of print, break line quadriple
     def p_semicolon_print(p):
         'semicolon_print : SEMICOLON'
+        track_line(p)
         # remove 'cout' from operators stack
         operator = stack_operators.pop()
         if operator != 'cout':
@@ -597,26 +743,28 @@ def PatitoParser(print_intermediate_code = False, quads = [], var_table = {}, ct
         '''b : ID
              | cte'''
         if p[1] != None:
+            track_line(p)
             var_id = p[1]
-            if var_id not in var_table:
+            entry = symbols.lookup(var_id)
+            if entry is None:
                 raise yacc.YaccError(f'Variable {var_id}, was not declared.')
             else:
                 # Get variable's memory direction and type
-                memory_dir = var_table[var_id]['memory_dir']
-                var_type = var_table[var_id]['type']
+                memory_dir = entry['memory_dir']
+                var_type = entry['type']
                 # if variable is set to negative perform previuos quad
                 nonlocal change_symbol
                 if change_symbol:
                     change_symbol = False
                     if var_type == 'int':
                         nonlocal cont_int
-                        quad = ('-', None, memory_dir, cont_int)
+                        quad = (NEGATE['int'], None, memory_dir, cont_int)
                         memory_dir = cont_int
                         save_quad(quad, None)
                         cont_int += 1
                     elif var_type == 'float':
                         nonlocal cont_float
-                        quad = ('-', None, memory_dir, cont_float)
+                        quad = (NEGATE['float'], None, memory_dir, cont_float)
                         memory_dir = cont_float
                         save_quad(quad, None)
                         cont_float += 1
@@ -631,22 +779,26 @@ def PatitoParser(print_intermediate_code = False, quads = [], var_table = {}, ct
         '''type : INT
                 | FLOAT'''
         var_type = p[1]
+        # Only the variables of this declaration group are typed
+        symbols.assign_type(var_type, allocate_var)
+
+    # Next free memory direction for a variable of the given type
+    def allocate_var(var_type):
         nonlocal cont_int, cont_float
-        for key in var_table:
-            if var_table[key]['type'] is None:
-                var_table[key]['type'] = var_type
-                if var_type == 'int':
-                    var_table[key]['memory_dir'] = cont_int
-                    cont_int += 1
-                elif var_type == 'float':
-                    var_table[key]['memory_dir'] = cont_float
-                    cont_float += 1
+        if var_type == 'int':
+            memory_dir = cont_int
+            cont_int += 1
+        elif var_type == 'float':
+            memory_dir = cont_float
+            cont_float += 1
+        return memory_dir
 
 
     # Create and add constants to operands stack
     def p_cte(p):
         '''cte : CTE_INT
             | CTE_FLOAT'''
+        track_line(p)
         cte = p[1]
         # Save constant in constant table
         if cte not in cte_table:
@@ -674,13 +826,13 @@ def PatitoParser(print_intermediate_code = False, quads = [], var_table = {}, ct
             change_symbol = False
             if cte_type == 'int':
                 nonlocal cont_int
-                quad = ('-', None, memory_dir, cont_int)
+                quad = (NEGATE['int'], None, memory_dir, cont_int)
                 memory_dir = cont_int
                 save_quad(quad, None)
                 cont_int += 1
             elif cte_type == 'float':
                 nonlocal cont_float
-                quad = ('-', None, memory_dir, cont_float)
+                quad = (NEGATE['float'], None, memory_dir, cont_float)
                 memory_dir = cont_float
                 save_quad(quad, None)
                 cont_float += 1
@@ -701,4 +853,32 @@ def PatitoParser(print_intermediate_code = False, quads = [], var_table = {}, ct
             print('    Expected token before {', p.value, '} in line', 
                   p.lineno, ' at position ', p.lexpos)
 
-    return yacc.yacc(start='program')
+    # Clear compiler state so the same parser can compile another program
+    # without rebuilding the PLY tables (used to keep parsers warm)
+    def reset(new_quads, new_var_table, new_cte_table):
+        nonlocal quads, var_table, cte_table, symbols, change_symbol, cont_quads
+        nonlocal cont_cte_int, cont_cte_float, cont_cte_string
+        nonlocal cont_int, cont_float, cont_bool, current_line, last_temp
+        quads = new_quads
+        var_table = new_var_table
+        symbols = Symbol_Table(var_table)
+        cte_table = new_cte_table
+        cont_cte_int = 0
+        cont_cte_float = 1000
+        cont_cte_string = 2000
+        cont_int = 3000
+        cont_float = 4000
+        cont_bool = 5000
+        change_symbol = False
+        cont_quads = 0
+        current_line = 0
+        last_temp = None
+        import_owners.clear()
+        stack_operands.clear()
+        stack_operators.clear()
+        stack_jumps.clear()
+        stack_for.clear()
+
+    parser = yacc.yacc(start='program')
+    parser.reset = reset
+    return parser
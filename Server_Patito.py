@@ -0,0 +1,207 @@
+# Long-running compile-and-run service for 'Patito' programs.
+#
+# Protocol: one JSON object per line in each direction.
+#   request  -> {"id": 1, "source": "program ... end", "max_instructions": 100000, "input": "1 2 3"}
+#   response <- {"id": 1, "ok": true, "output": "...", "errors": [], "timing": {...}}
+#
+# Usage:
+#   python Server_Patito.py --port 8765
+#   python Server_Patito.py --unix /tmp/patito.sock
+import argparse
+import asyncio
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+
+from Scanner_Parser_Patito import PatitoLexer, PatitoParser
+from Virtual_Machine import Virtual_Machine
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_MAX_INSTRUCTIONS = 10_000_000
+# Largest request line accepted from a client (source code is sent inline)
+MAX_REQUEST_SIZE = 16 * 1024 * 1024
+
+
+#####################################################
+# Worker process
+#####################################################
+# Lexer and parser built once per worker process and reused by every request
+worker_lexer = None
+worker_parser = None
+
+
+def init_worker():
+    global worker_lexer, worker_parser
+    worker_lexer = PatitoLexer()
+    worker_parser = PatitoParser(quads=[], var_table={}, cte_table={})
+
+
+# Used at start up to make the pool spawn its processes before the first request
+def warm_worker():
+    return os.getpid()
+
+
+def compile_program(source):
+    quads = []
+    var_table = {}
+    cte_table = {}
+    failure = None
+    worker_parser.reset(quads, var_table, cte_table)
+    worker_lexer.lineno = 1
+    # Parser and lexer report errors by printing them
+    diagnostics = io.StringIO()
+    with redirect_stdout(diagnostics):
+        try:
+            worker_parser.parse(source, lexer=worker_lexer)
+        except Exception as e:
+            failure = f'Parsing error: {e}'
+    errors = [line.strip() for line in diagnostics.getvalue().splitlines() if line.strip()]
+    if failure:
+        errors.append(failure)
+    return quads, var_table, cte_table, errors
+
+
+# input is the text read by cin, programs never read the worker's stdin
+def run_program(source, max_instructions, input = ''):
+    start = time.perf_counter()
+    quads, var_table, cte_table, errors = compile_program(source)
+    compiled = time.perf_counter()
+    output = io.StringIO()
+    if not errors:
+        with redirect_stdout(output):
+            try:
+                vm = Virtual_Machine(quads, var_table, cte_table, input=io.StringIO(input))
+                vm.execute(max_instructions)
+            except Exception as e:
+                errors.append(f'Error running program on Virtual Machine: {e}')
+    finished = time.perf_counter()
+    return {
+        'ok': len(errors) == 0,
+        'output': output.getvalue(),
+        'errors': errors,
+        'timing': {
+            'compile_ms': (compiled - start) * 1000,
+            'execute_ms': (finished - compiled) * 1000,
+            'worker_pid': os.getpid(),
+        },
+    }
+
+
+#####################################################
+# Server
+#####################################################
+class Patito_Server:
+    def __init__(self, workers = None, max_instructions = DEFAULT_MAX_INSTRUCTIONS):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_instructions = max_instructions
+        self.executor = None
+        self.server = None
+
+    async def start(self, host = DEFAULT_HOST, port = DEFAULT_PORT, unix_path = None):
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker)
+        loop = asyncio.get_running_loop()
+        # Spawn and warm every worker before accepting connections
+        await asyncio.gather(*(loop.run_in_executor(self.executor, warm_worker)
+                               for _ in range(self.workers)))
+        if unix_path:
+            self.server = await asyncio.start_unix_server(
+                self.handle_client, path=unix_path, limit=MAX_REQUEST_SIZE)
+        else:
+            self.server = await asyncio.start_server(
+                self.handle_client, host, port, limit=MAX_REQUEST_SIZE)
+        return self.server
+
+    async def close(self):
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.executor:
+            self.executor.shutdown()
+
+    async def handle_request(self, line):
+        received = time.perf_counter()
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return {'id': None, 'ok': False, 'output': '', 'errors': [f'Invalid JSON: {e}']}
+        if not isinstance(request, dict):
+            return {'id': None, 'ok': False, 'output': '', 'errors': ['Request must be a JSON object']}
+        request_id = request.get('id')
+        source = request.get('source')
+        if not isinstance(source, str):
+            return {'id': request_id, 'ok': False, 'output': '', 'errors': ['Missing "source" string']}
+        # Clients may lower the budget but never raise it above the server limit
+        max_instructions = request.get('max_instructions', self.max_instructions)
+        if not isinstance(max_instructions, int) or max_instructions <= 0:
+            max_instructions = self.max_instructions
+        max_instructions = min(max_instructions, self.max_instructions)
+        input = request.get('input', '')
+        if not isinstance(input, str):
+            return {'id': request_id, 'ok': False, 'output': '', 'errors': ['"input" must be a string']}
+
+        loop = asyncio.get_running_loop()
+        try:
+            response = await loop.run_in_executor(
+                self.executor, run_program, source, max_instructions, input)
+        except Exception as e:
+            response = {'ok': False, 'output': '', 'errors': [f'Worker failure: {e}'], 'timing': {}}
+        response['id'] = request_id
+        response['timing']['total_ms'] = (time.perf_counter() - received) * 1000
+        return response
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Request line longer than MAX_REQUEST_SIZE
+                    response = {'id': None, 'ok': False, 'output': '', 'errors': ['Request too large']}
+                    writer.write(json.dumps(response).encode() + b'\n')
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                response = await self.handle_request(line)
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host, port, unix_path, workers, max_instructions):
+    server = Patito_Server(workers, max_instructions)
+    await server.start(host, port, unix_path)
+    where = unix_path if unix_path else f'{host}:{port}'
+    print(f'Patito server listening on {where} with {server.workers} workers')
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Compile and run 'Patito' programs over JSON lines.")
+    arg_parser.add_argument('--host', default=DEFAULT_HOST)
+    arg_parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    arg_parser.add_argument('--unix', dest='unix_path', help='listen on a Unix socket instead of TCP')
+    arg_parser.add_argument('--workers', type=int, default=None,
+                            help='worker processes (default: number of CPUs)')
+    arg_parser.add_argument('--max-instructions', type=int, default=DEFAULT_MAX_INSTRUCTIONS,
+                            help='instruction budget per program')
+    args = arg_parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix_path, args.workers, args.max_instructions))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
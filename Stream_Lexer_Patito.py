@@ -0,0 +1,149 @@
+# Streaming lexer for 'Patito', an alternative to PatitoLexer for very large sources.
+#
+# Produces the same token types as PatitoLexer but reads the source in chunks
+# and yields tokens from a generator, so memory stays flat no matter how big
+# the file is. Every token kind has its own group in a single regular
+# expression, so most tokens are built without calling a rule function.
+#
+# Usage:
+#   lexer = Stream_Lexer()
+#   with open('main_VM.txt', 'r') as file:
+#       parser.parse(lexer=lexer.input_file(file))
+import re
+
+from Scanner_Parser_Patito import reserved
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Same rules and priorities as PatitoLexer, 'error' catches any other character.
+TOKEN_REGEX = re.compile(r'''
+    (?P<ignore>[ \t]+)
+  | (?P<ID>[a-zA-Z][a-zA-Z0-9]*)
+  | (?P<newline>\n+)
+  | (?P<CTE_STRING>"[^"\n]*")
+  | (?P<CTE_FLOAT>[0-9]+\.[0-9]+)
+  | (?P<CTE_INT>[0-9]+)
+  | (?P<SEMICOLON>;)
+  | (?P<LEFTPARENTHESIS>\()
+  | (?P<RIGHTPARENTHESIS>\))
+  | (?P<COMA>,)
+  | (?P<EQUAL>=)
+  | (?P<ADD>\+)
+  | (?P<MINUS>-)
+  | (?P<MULTIPLY>\*)
+  | (?P<DIVIDE>/)
+  | (?P<LEFTBRACE>\{)
+  | (?P<RIGHTBRACE>\})
+  | (?P<COLON>:)
+  | (?P<GREATERTHAN>>)
+  | (?P<LESSTHAN><)
+  | (?P<NOT>!=)
+  | (?P<error>.)
+''', re.VERBOSE)
+
+# Token kinds whose value is the matched text itself
+SYMBOLS = frozenset(name for name in TOKEN_REGEX.groupindex
+                    if name not in ('ignore', 'ID', 'newline', 'CTE_STRING',
+                                    'CTE_FLOAT', 'CTE_INT', 'error'))
+
+
+# Token with the attributes PLY's parser reads
+class Token:
+    __slots__ = ('type', 'value', 'lineno', 'lexpos')
+
+    def __init__(self, type, value, lineno, lexpos):
+        self.type = type
+        self.value = value
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+    def __repr__(self):
+        return f'LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})'
+
+
+# Split a stream of text chunks at line ends, tokens never span lines.
+# Only the new chunk is searched for a line end and the pieces of an
+# unfinished line are joined once, so a long line costs linear time.
+def complete_lines(chunks):
+    pieces = []
+    for chunk in chunks:
+        cut = chunk.rfind('\n') + 1
+        if cut == 0:
+            pieces.append(chunk)
+            continue
+        pieces.append(chunk[:cut])
+        yield ''.join(pieces)
+        pieces = [chunk[cut:]] if cut < len(chunk) else []
+    if pieces:
+        yield ''.join(pieces)
+
+
+def read_chunks(file, chunk_size):
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+# Generator of tokens from an iterable of text chunks
+def tokenize_chunks(chunks, lexer = None):
+    lineno = 1
+    base = 0
+    get_reserved = reserved.get
+    for text in complete_lines(chunks):
+        for match in TOKEN_REGEX.finditer(text):
+            kind = match.lastgroup
+            if kind in SYMBOLS:
+                yield Token(kind, match.group(), lineno, base + match.start())
+            elif kind == 'ignore':
+                continue
+            elif kind == 'ID':
+                value = match.group()
+                yield Token(get_reserved(value, 'ID'), value, lineno, base + match.start())
+            elif kind == 'newline':
+                lineno += match.end() - match.start()
+                if lexer is not None:
+                    lexer.lineno = lineno
+            elif kind == 'CTE_INT':
+                yield Token(kind, int(match.group()), lineno, base + match.start())
+            elif kind == 'CTE_FLOAT':
+                yield Token(kind, float(match.group()), lineno, base + match.start())
+            elif kind == 'CTE_STRING':
+                yield Token(kind, match.group()[1:-1], lineno, base + match.start())
+            else:
+                print('   Invalid character: ', match.group(), ' in line',
+                      lineno, ' at position ', base + match.start())
+        base += len(text)
+
+
+# Generator of tokens read from a file object in chunks
+def tokenize(file, chunk_size = DEFAULT_CHUNK_SIZE):
+    return tokenize_chunks(read_chunks(file, chunk_size))
+
+
+# Lexer object that PLY's parser can use in place of PatitoLexer
+class Stream_Lexer:
+    def __init__(self, chunk_size = DEFAULT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.lineno = 1
+        self.tokens = iter(())
+
+    # Source given as a string, scanned in chunks like a file
+    def input(self, data):
+        chunks = (data[i:i + self.chunk_size] for i in range(0, len(data), self.chunk_size))
+        self.lineno = 1
+        self.tokens = tokenize_chunks(chunks, self)
+        return self
+
+    # Source read incrementally from an open file
+    def input_file(self, file):
+        self.lineno = 1
+        self.tokens = tokenize_chunks(read_chunks(file, self.chunk_size), self)
+        return self
+
+    def token(self):
+        return next(self.tokens, None)
+
+    def __iter__(self):
+        return self.tokens
@@ -0,0 +1,72 @@
+# Symbol table used by the 'Patito' parser.
+#
+# Variables are declared in groups (`var a, b, c: int;`) whose type is only
+# known at the end of the group, so the names waiting for their type are kept
+# apart from the table. Typing a group touches only that group instead of
+# every variable declared so far.
+#
+# Each scope is a dictionary {name: {'type': ..., 'memory_dir': ...}}. The
+# global scope is the var_table shared with the Virtual Machine.
+class Symbol_Table:
+    def __init__(self, var_table = None):
+        if var_table is None:
+            var_table = {}
+        self.scopes = [var_table]
+        # Names of the current declaration group, still without type
+        self.pending = []
+
+    # Add a variable without type to the current scope,
+    # returns False if it already exists in that scope
+    def declare(self, var_id):
+        scope = self.scopes[-1]
+        if var_id in scope:
+            return False
+        scope[var_id] = {
+            'type': None,
+            'memory_dir': None
+        }
+        self.pending.append(var_id)
+        return True
+
+    # Give a type and a memory direction to every variable of the pending group.
+    # allocate(var_type) returns the next free memory direction of that type.
+    def assign_type(self, var_type, allocate):
+        scope = self.scopes[-1]
+        for var_id in self.pending:
+            entry = scope[var_id]
+            entry['type'] = var_type
+            entry['memory_dir'] = allocate(var_type)
+        self.pending.clear()
+
+    # Add a variable whose type and memory direction are already known, like
+    # the variables of an imported module. Returns False if it already exists.
+    def define(self, var_id, var_type, memory_dir):
+        scope = self.scopes[-1]
+        if var_id in scope:
+            return False
+        scope[var_id] = {
+            'type': var_type,
+            'memory_dir': memory_dir
+        }
+        return True
+
+    # Find a variable from the innermost scope outwards, None if not declared
+    def lookup(self, var_id):
+        for scope in reversed(self.scopes):
+            entry = scope.get(var_id)
+            if entry is not None:
+                return entry
+        return None
+
+    def __contains__(self, var_id):
+        return self.lookup(var_id) is not None
+
+    def push_scope(self):
+        self.scopes.append({})
+
+    def pop_scope(self):
+        if len(self.scopes) == 1:
+            raise IndexError('Cannot remove the global scope')
+        if self.pending:
+            raise ValueError('Scope closed with variables still waiting for a type')
+        return self.scopes.pop()
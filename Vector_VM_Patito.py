@@ -0,0 +1,222 @@
+# Lockstep Virtual Machine that runs one 'Patito' program over many inputs.
+#
+# Every memory cell is a NumPy array with one lane per input set, so each
+# quadruple runs as one array operation for all lanes. Lanes that take
+# different branches get their own program counter; at each step the lanes
+# with the lowest program counter run the quadruple under a mask, until every
+# lane reaches the end of the program.
+#
+# Ints are NumPy int64 and wrap around on overflow, like the int64 mode of
+# Virtual_Machine with overflow='wrap'. Variables missing from the input table
+# start at 0.
+#
+# Usage:
+#   program = Program(quads, var_table, cte_table)
+#   vm = Vector_Virtual_Machine(program, {'n': [5, 10, 20]})
+#   vm.execute()
+#   vm.columns()    -> {'n': array([5, 10, 20]), 'total': array([...]), ...}
+#   vm.outputs[1]   -> text printed by the second lane
+import numpy as np
+
+from Opcodes_Patito import READ, TYPED_OPCODES, to_int64
+
+# NumPy dtype of the cells of each memory segment
+SEGMENT_DTYPES = {
+    'cte_int': np.int64,
+    'cte_float': np.float64,
+    'cte_string': object,
+    'int': np.int64,
+    'float': np.float64,
+    'bool': np.bool_,
+}
+
+# Generic operator -> NumPy ufunc, written in place into the result cell
+UFUNCS = {
+    '+': np.add,
+    '-': np.subtract,
+    '*': np.multiply,
+    '/': np.true_divide,
+    '>': np.greater,
+    '<': np.less,
+    '!=': np.not_equal,
+}
+
+
+class Vector_Virtual_Machine:
+    def __init__(self, program, table = None, lanes = None):
+        for operator, l_operand_mem, r_operand_mem, result_mem in program.quadruples:
+            if operator in READ.values():
+                raise ValueError('cin is not supported in lockstep mode, give the values in the input table')
+        if table is None:
+            table = {}
+        columns = {name: np.asarray(column) for name, column in table.items()}
+        sizes = {len(column) for column in columns.values()}
+        if lanes is not None:
+            sizes.add(lanes)
+        if len(sizes) != 1:
+            raise ValueError('Every input column needs the same number of lanes')
+        self.program = program
+        self.var_table = program.var_table
+        self.lanes = sizes.pop()
+        self.allocate_memory()
+        for name, column in columns.items():
+            self.set_column(name, column)
+        self.instructions = self.decode()
+        # Output and error of each lane
+        self.outputs = [''] * self.lanes
+        self.errors = [None] * self.lanes
+        self.steps = 0
+        self.finished = False
+
+    # One array per memory cell, constants repeated in every lane
+    def allocate_memory(self):
+        self.memory = [None] * len(self.program.constants)
+        for name, (start, end, base_dir, dtype) in self.program.segment_layout().items():
+            for i in range(start, end):
+                self.memory[i] = np.zeros(self.lanes, dtype=SEGMENT_DTYPES[name])
+        for cte, entry in self.program.cte_table.items():
+            value = entry.get('value', cte)
+            if entry['type'] == 'int':
+                value = to_int64(value, 'wrap')
+            self.memory[self.program.get_memory_dir(entry['memory_dir'])][:] = value
+
+    def set_column(self, name, column):
+        if name not in self.var_table:
+            raise KeyError(f'Variable {name} was not declared')
+        entry = self.var_table[name]
+        if entry['type'] == 'int' and column.dtype.kind not in 'biu':
+            raise ValueError(f'Variable {name} is an int but its column has dtype {column.dtype}')
+        self.memory[self.program.get_memory_dir(entry['memory_dir'])][:] = column
+
+    # Instructions of the program with ufuncs as handlers
+    def decode(self):
+        instructions = []
+        for operator, handler, l_operand, r_operand, result in self.program.instructions:
+            generic = TYPED_OPCODES[operator][0] if operator in TYPED_OPCODES else operator
+            handler = UFUNCS.get(generic)
+            instructions.append((operator, handler, generic == '/', l_operand, r_operand, result))
+        return instructions
+
+    # Stop lanes with an error, the other lanes keep running
+    def fail_lanes(self, pcs, failed, message, end):
+        for lane in np.flatnonzero(failed):
+            self.errors[lane] = message
+        pcs[failed] = end
+
+    def execute(self, max_steps = None):
+        memory = self.memory
+        instructions = self.instructions
+        end = len(instructions)
+        # Text printed by each lane
+        outputs = np.full(self.lanes, '', dtype=object)
+        # While every lane is at the same quadruple only pc is used,
+        # once they split each lane follows its own entry of pcs
+        uniform = True
+        pc = 0
+        pcs = None
+        steps = 0
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            while self.lanes > 0:
+                if uniform:
+                    if pc >= end:
+                        break
+                    mask = None
+                else:
+                    pc = int(pcs.min())
+                    if pc >= end:
+                        break
+                    mask = pcs == pc
+                    if mask.all():
+                        # Lanes joined again after a branch
+                        uniform = True
+                        mask = None
+                if max_steps is not None and steps == max_steps:
+                    raise RuntimeError(f'Step budget of {max_steps} exceeded at quad {pc}')
+                steps += 1
+                operator, handler, divide, l_operand, r_operand, result = instructions[pc]
+                target = pc + 1
+
+                if handler is not None:
+                    if divide:
+                        zero = memory[r_operand] == 0
+                        if mask is not None:
+                            zero &= mask
+                        if zero.any():
+                            if uniform:
+                                uniform = False
+                                pcs = np.full(self.lanes, pc, dtype=np.int64)
+                                mask = np.ones(self.lanes, dtype=bool)
+                            self.fail_lanes(pcs, zero, 'division by zero', end)
+                            mask &= ~zero
+                    # Lanes outside the mask keep their value
+                    handler(memory[l_operand], memory[r_operand], out=memory[result],
+                            where=True if mask is None else mask)
+                elif operator == 'GotoF' or operator == 'GotoT' or operator == 'Loop':
+                    if operator == 'Loop':
+                        # Fused increment, compare and jump at the end of a for
+                        counter = memory[l_operand]
+                        np.add(counter, 1, out=counter, where=True if mask is None else mask)
+                        condition = counter <= memory[r_operand]
+                    elif operator == 'GotoF':
+                        condition = ~memory[l_operand]
+                    else:
+                        condition = memory[l_operand]
+                    # Lanes where condition is True jump to result
+                    if mask is None:
+                        if condition.all():
+                            pc = result
+                            continue
+                        if condition.any():
+                            uniform = False
+                            pcs = np.where(condition, result, target)
+                            continue
+                    else:
+                        pcs[mask] = np.where(condition[mask], result, target)
+                        continue
+                elif operator == 'Goto':
+                    target = result
+                elif operator == '=':
+                    np.copyto(memory[result], memory[l_operand], where=True if mask is None else mask)
+                elif operator == 'negi' or operator == 'negf' or operator == 'neg':
+                    np.negative(memory[r_operand], out=memory[result], where=True if mask is None else mask)
+                elif operator == 'print':
+                    if l_operand is None:
+                        text = '\n'
+                    else:
+                        values = memory[l_operand] if mask is None else memory[l_operand][mask]
+                        # NumPy formats floats the same way as str()
+                        text = values.astype(str).astype(object)
+                    if mask is None:
+                        outputs += text
+                    else:
+                        outputs[mask] += text
+                else:
+                    raise ValueError(f'Operator {operator} not supported in lockstep mode')
+
+                if uniform:
+                    pc = target
+                else:
+                    pcs[mask] = target
+        self.steps = steps
+        self.outputs = outputs.tolist()
+        self.finished = True
+
+    # Final value of each variable as one array per variable
+    def columns(self, names = None):
+        if names is None:
+            names = self.var_table
+        columns = {}
+        for name in names:
+            if name not in self.var_table:
+                raise KeyError(f'Variable {name} was not declared')
+            entry = self.var_table[name]
+            columns[name] = self.memory[self.program.get_memory_dir(entry['memory_dir'])].copy()
+        return columns
+
+    # Columns as a pandas DataFrame, with the output and error of each lane
+    def to_dataframe(self, names = None):
+        import pandas as pd
+        frame = pd.DataFrame(self.columns(names))
+        frame['output'] = self.outputs
+        frame['error'] = self.errors
+        return frame
@@ -1,8 +1,189 @@
-class Virtual_Machine:
-    def __init__(self, quads, var_table, cte_table):
-        self.quadruples = quads
-        self.var_table = var_table
-        self.cte_table = cte_table
+import codecs
+import functools
+import hashlib
+import io
+import itertools
+import os
+import pickle
+import signal
+import sys
+import time
+import zlib
+from types import MappingProxyType
+
+from Opcodes_Patito import INT64_OPCODES, JUMP_OPERATORS, OPERATIONS, OVERFLOW_MODES, TYPED_OPCODES, int64_handler, to_int64
+
+# Checkpoint files start with this header followed by the format version
+CHECKPOINT_MAGIC = b'PTVM'
+CHECKPOINT_VERSION = 1
+# Instructions between checks for a checkpoint signal
+SIGNAL_POLL_INTERVAL = 10000
+# None keeps Python's unbounded ints, 'int64' gives ints 64-bit semantics
+INT_MODES = (None, 'int64')
+# Characters read from the input at once by cin
+INPUT_CHUNK_SIZE = 64 * 1024
+
+
+# Checkpoints only hold builtin values, refuse anything that would import code
+class Checkpoint_Unpickler(pickle.Unpickler):
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(f'Checkpoint contains unexpected object {module}.{name}')
+
+
+# Values for cin, read from a text stream in big chunks. Each chunk is split
+# at once and its values are converted when a cin asks for them.
+class Input_Reader:
+    def __init__(self, stream, chunk_size = INPUT_CHUNK_SIZE):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.read_chunk = self.chunk_reader(stream, chunk_size)
+        self.values = []
+        self.position = 0
+        # End of the last chunk, the value may continue in the next one
+        self.carry = ''
+        self.finished = False
+        # Values read so far, saved in checkpoints
+        self.count = 0
+
+    # Function that returns the text available now, up to chunk_size, and '' at the end.
+    # read(chunk_size) of a pipe or terminal would wait for a full chunk or the end of input.
+    @staticmethod
+    def chunk_reader(stream, chunk_size):
+        buffer = getattr(stream, 'buffer', None)
+        if buffer is not None and hasattr(buffer, 'read1'):
+            decoder = codecs.getincrementaldecoder(stream.encoding or 'utf-8')(stream.errors or 'strict')
+
+            def read_available():
+                while True:
+                    data = buffer.read1(chunk_size)
+                    text = decoder.decode(data, final=not data)
+                    # Retry when the bytes read end in the middle of a character
+                    if text or not data:
+                        return text
+            return read_available
+        if getattr(stream, 'isatty', lambda: False)():
+            return stream.readline
+        return lambda: stream.read(chunk_size)
+
+    def fill(self):
+        while self.position == len(self.values):
+            if self.finished:
+                raise EOFError(f'cin found no more input after {self.count} values')
+            chunk = self.read_chunk()
+            text = self.carry + chunk
+            self.values = text.split()
+            self.position = 0
+            self.carry = ''
+            if not chunk:
+                self.finished = True
+            elif self.values and not text[-1].isspace():
+                self.carry = self.values.pop()
+
+    def next_value(self):
+        if self.position == len(self.values):
+            self.fill()
+        text = self.values[self.position]
+        self.position += 1
+        self.count += 1
+        return text
+
+    def read_int(self):
+        text = self.next_value()
+        try:
+            return int(text)
+        except ValueError:
+            raise ValueError(f'cin expected an int but found {text!r}') from None
+
+    def read_float(self):
+        text = self.next_value()
+        try:
+            return float(text)
+        except ValueError:
+            raise ValueError(f'cin expected a float but found {text!r}') from None
+
+    # Skip values already read, used when resuming from a checkpoint
+    def skip(self, count):
+        for _ in range(count):
+            self.next_value()
+
+
+# Read-only view over one segment of the Virtual Machine memory, no cells are copied
+class Memory_Segment:
+    def __init__(self, name, memory, start, end, base_dir, dtype = None, fill = None):
+        self.name = name
+        self.memory = memory
+        self.start = start
+        self.end = end
+        # Memory direction used by the parser for the first cell of the segment
+        self.base_dir = base_dir
+        self.dtype = dtype
+        # Value given to cells never written when exported, unless to_numpy gets one
+        self.fill = fill
+
+    def __len__(self):
+        return self.end - self.start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.memory[self.start + i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f'Index {index} out of segment {self.name}')
+        return self.memory[self.start + index]
+
+    def __iter__(self):
+        return itertools.islice(self.memory, self.start, self.end)
+
+    def __repr__(self):
+        return f'Memory_Segment({self.name}, cells {self.start}-{self.end})'
+
+    def memory_dir(self, index):
+        return self.base_dir + index
+
+    def count(self, value):
+        return self.memory[self.start:self.end].count(value)
+
+    # Copy only this segment into a NumPy array. Cells never written are None,
+    # replaced by fill when given, otherwise the array has dtype object so they
+    # stay None instead of becoming nan, False or 0.
+    def to_numpy(self, dtype = None, fill = None):
+        import numpy as np
+        dtype = dtype or self.dtype or object
+        if fill is None:
+            fill = self.fill
+        if fill is None:
+            if any(value is None for value in self):
+                return np.array(list(self), dtype=object)
+            values = iter(self)
+        else:
+            values = (fill if value is None else value for value in self)
+        try:
+            return np.fromiter(values, dtype=dtype, count=len(self))
+        except (TypeError, ValueError, OverflowError):
+            return np.array(list(self), dtype=object)
+
+
+# Compiled program that never changes once built: quadruples decoded to
+# instructions, memory layout and the memory image with the constants already
+# written. Many Virtual Machine instances can share one Program, each of them
+# only copies the constant image into its own memory.
+class Program:
+    # With a timings dictionary the seconds spent in each step of the build are stored in it
+    def __init__(self, quads, var_table, cte_table, int_mode = None, overflow = 'trap', timings = None):
+        start = time.perf_counter()
+        if int_mode not in INT_MODES:
+            raise ValueError(f'Unknown int mode {int_mode}, expected one of {INT_MODES}')
+        if overflow not in OVERFLOW_MODES:
+            raise ValueError(f'Unknown overflow mode {overflow}, expected one of {OVERFLOW_MODES}')
+        # Private copies, later changes to the parser tables do not reach the program
+        self.quadruples = tuple(tuple(quad) for quad in quads)
+        self.var_table = MappingProxyType({name: MappingProxyType(dict(entry))
+                                           for name, entry in var_table.items()})
+        self.cte_table = MappingProxyType({cte: MappingProxyType(dict(entry))
+                                           for cte, entry in cte_table.items()})
+        self.int_mode = int_mode
+        self.overflow = overflow
         # Define memory starts used by Parser
         self.mem_cte_int = 0
         self.mem_cte_float = 1000
@@ -11,6 +192,21 @@ class Virtual_Machine:
         self.mem_float = 4000
         self.mem_bool = 5000
         self.mem_limit = 6000
+        # Handler of each typed opcode, the generic function of its operator
+        self.operations = dict(OPERATIONS)
+        for opcode, (operator, l_type, r_type) in TYPED_OPCODES.items():
+            self.operations[opcode] = OPERATIONS[operator]
+        if int_mode == 'int64':
+            # Only operations that give ints pay for the range check
+            for opcode in INT64_OPCODES:
+                operator = TYPED_OPCODES[opcode][0]
+                self.operations[opcode] = int64_handler(OPERATIONS[operator], operator, overflow)
+            for operator in ('+', '-', '*'):
+                self.operations[operator] = int64_handler(OPERATIONS[operator], operator, overflow, int)
+            negate = lambda l_value, r_value: -r_value
+            self.operations['negi'] = int64_handler(negate, 'neg', overflow)
+            self.operations['neg'] = int64_handler(negate, 'neg', overflow, int)
+        self.operations = MappingProxyType(self.operations)
         self.start_cte_int = 0
         self.start_cte_float = 0
         self.start_cte_string = 0
@@ -18,9 +214,19 @@ class Virtual_Machine:
         self.start_float = self.start_int
         self.start_bool = self.start_int
         self.end = self.start_int
+        allocate_start = time.perf_counter()
         self.allocate_memory()
-        self.save_cte()
-    
+        save_start = time.perf_counter()
+        self.constants = self.save_cte()
+        decode_start = time.perf_counter()
+        self.instructions = self.decode()
+        decode_end = time.perf_counter()
+        if timings is not None:
+            timings['program_setup'] = allocate_start - start + time.perf_counter() - decode_end
+            timings['allocate_memory'] = save_start - allocate_start
+            timings['save_cte'] = decode_start - save_start
+            timings['decode'] = decode_end - decode_start
+
     def allocate_memory(self):
         for cte in self.cte_table:
             memory_dir = self.cte_table[cte]['memory_dir']
@@ -41,7 +247,8 @@ class Virtual_Machine:
 
         for quad in self.quadruples:
             operator, l_operand_mem, r_operand_mem, memory_dir = quad
-            if memory_dir != None:
+            # Jumps keep a quadruple index in the result, not a memory direction
+            if memory_dir != None and operator not in JUMP_OPERATORS:
                 if self.mem_int <= memory_dir < self.mem_float:
                     self.start_float = max(self.start_float, memory_dir)
                 elif self.mem_float <= memory_dir < self.mem_bool:
@@ -60,9 +267,6 @@ class Virtual_Machine:
         else:
             self.end = self.start_bool
 
-        self.memory = [None] * self.end 
-
-
 
     def get_memory_dir(self, memory_dir):
         if memory_dir == None:
@@ -85,80 +289,431 @@ class Virtual_Machine:
         return m_dir
 
 
+    # Memory image with every constant in its cell, copied by each instance.
+    # A 'value' entry holds the constant when the key is not the constant itself.
+    def save_cte(self):
+        memory = [None] * self.end
+        for cte, entry in self.cte_table.items():
+            cte = entry.get('value', cte)
+            if self.int_mode == 'int64' and entry['type'] == 'int':
+                cte = to_int64(cte, self.overflow)
+            memory[self.get_memory_dir(entry['memory_dir'])] = cte
+        return tuple(memory)
+
+
+    # Translate quadruples once: memory directions become memory indexes
+    # and each operation gets the handler of its opcode
+    def decode(self):
+        instructions = []
+        for operator, l_operand_mem, r_operand_mem, result_mem in self.quadruples:
+            handler = self.operations.get(operator)
+            if operator == '-' and l_operand_mem == None:
+                # Unary minus of a generic quadruple
+                operator = 'neg'
+                handler = self.operations.get(operator)
+            if handler is not None and l_operand_mem == None:
+                # Checked unary minus of int64 mode, the handler reads the operand twice
+                l_operand_mem = r_operand_mem
+            if operator not in JUMP_OPERATORS:
+                result_mem = self.get_memory_dir(result_mem)
+            instructions.append((operator, handler,
+                                 self.get_memory_dir(l_operand_mem),
+                                 self.get_memory_dir(r_operand_mem),
+                                 result_mem))
+        return tuple(instructions)
+
+
+    # Segment name -> (first cell, end cell, memory direction of first cell, NumPy dtype)
+    def segment_layout(self):
+        return {
+            'cte_int': (self.start_cte_int, self.start_cte_float, self.mem_cte_int, 'int64'),
+            'cte_float': (self.start_cte_float, self.start_cte_string, self.mem_cte_float, 'float64'),
+            'cte_string': (self.start_cte_string, self.start_int, self.mem_cte_string, object),
+            'int': (self.start_int, self.start_float, self.mem_int, 'int64'),
+            'float': (self.start_float, self.start_bool, self.mem_float, 'float64'),
+            'bool': (self.start_bool, self.end, self.mem_bool, 'bool'),
+        }
+
+
+    # Fingerprint of the program, only needed by checkpoints so it is computed
+    # the first time it is read. Programs with the same quadruples can still
+    # differ in their constants and variables.
+    @functools.cached_property
+    def hash(self):
+        fingerprint = (list(self.quadruples),
+                       [(cte, dict(entry)) for cte, entry in self.cte_table.items()],
+                       [(name, dict(entry)) for name, entry in self.var_table.items()])
+        return hashlib.sha256(repr(fingerprint).encode()).hexdigest()
+
+
+    # New execution instance of this program
+    def instance(self, output = None, input = None):
+        return Virtual_Machine.from_program(self, output, input)
+
+
+# Execution instance of a Program: its own memory, program counter and output.
+# Instances share nothing mutable, so each thread can run its own instance.
+class Virtual_Machine:
+    def __init__(self, quads, var_table, cte_table, int_mode = None, overflow = 'trap',
+                 output = None, input = None):
+        self.attach(Program(quads, var_table, cte_table, int_mode, overflow), output, input)
+
+    @classmethod
+    def from_program(cls, program, output = None, input = None):
+        vm = cls.__new__(cls)
+        vm.attach(program, output, input)
+        return vm
+
+    # output and input are text streams, None uses sys.stdout and sys.stdin
+    def attach(self, program, output, input):
+        self.program = program
+        self.quadruples = program.quadruples
+        self.var_table = program.var_table
+        self.cte_table = program.cte_table
+        self.int_mode = program.int_mode
+        self.overflow = program.overflow
+        self.output = output
+        self.input = input
+        # Created on the first execute, sys.stdin may change until then
+        self.reader = None
+        self.memory = list(program.constants)
+        # Execution state, saved in checkpoints
+        self.pc = 0
+        self.executed = 0
+        # Characters written to the output
+        self.output_position = 0
+        self.values_read = 0
+        self.finished = False
+        self.checkpoint_requested = False
+        # Counters of the last execute, returned by it
+        self.run_counters = None
+
+
+    def get_memory_dir(self, memory_dir):
+        return self.program.get_memory_dir(memory_dir)
+
+
     def save_to_memory(self, memory_dir, value):
         m_dir = self.get_memory_dir(memory_dir)
         self.memory[m_dir] = value
 
 
-    def save_cte(self):
-        for cte in self.cte_table:
-            memory_dir = self.cte_table[cte]['memory_dir']
-            self.save_to_memory(memory_dir, cte)
-
-
-    def execute(self):
-        pc = 0
-        while pc < len(self.quadruples):
-            quad = self.quadruples[pc]
-            operator, l_operand_mem, r_operand_mem, result_mem = quad
-            l_operand_mem = self.get_memory_dir(l_operand_mem)
-            r_operand_mem = self.get_memory_dir(r_operand_mem)
-
-            if operator == '+':
-                value = self.memory[l_operand_mem] + self.memory[r_operand_mem]
-                self.save_to_memory(result_mem, value)
-            elif operator == '-':
-                if l_operand_mem == None:
-                    value = self.memory[r_operand_mem] * -1
-                    self.save_to_memory(result_mem, value)
-                else:
-                    value = self.memory[l_operand_mem] - self.memory[r_operand_mem]
-                    self.save_to_memory(result_mem, value)
-            elif operator == '*':
-                value = self.memory[l_operand_mem] * self.memory[r_operand_mem]
-                self.save_to_memory(result_mem, value)
-            elif operator == '/':
-                value = self.memory[l_operand_mem] / self.memory[r_operand_mem]
-                self.save_to_memory(result_mem, value)
-            elif operator == '>':
-                if self.memory[l_operand_mem] > self.memory[r_operand_mem]:
-                    self.save_to_memory(result_mem, True)
-                else:
-                    self.save_to_memory(result_mem, False)
-            elif operator == '<':
-                if self.memory[l_operand_mem] < self.memory[r_operand_mem]:
-                    self.save_to_memory(result_mem, True)
-                else:
-                    self.save_to_memory(result_mem, False)
-            elif operator == '!=':
-                if self.memory[l_operand_mem] != self.memory[r_operand_mem]:
-                    self.save_to_memory(result_mem, True)
-                else:
-                    self.save_to_memory(result_mem, False)
-            elif operator == '=':
-                value = self.memory[l_operand_mem]
-                self.save_to_memory(result_mem, value)
-            elif operator == 'Goto':
-                pc = result_mem
-                continue
-            elif operator == 'GotoF':
-                if not self.memory[l_operand_mem]:
-                    pc = result_mem
-                    continue
-            elif operator == 'GotoT':
-                if self.memory[l_operand_mem]:
-                    pc = result_mem
+    # Instruction count at which execute has to stop and check budget and checkpoints
+    def next_event(self, executed, budget_end, checkpoint_interval, poll_signal):
+        events = []
+        if budget_end != None:
+            events.append(budget_end)
+        if checkpoint_interval:
+            events.append((executed // checkpoint_interval + 1) * checkpoint_interval)
+        if poll_signal:
+            events.append(executed + SIGNAL_POLL_INTERVAL)
+        if events:
+            return min(events)
+        return None
+
+
+    def request_checkpoint(self, signum, frame):
+        self.checkpoint_requested = True
+
+
+    # Run from the current pc. Optionally save a checkpoint every
+    # checkpoint_interval instructions, and save one and stop when
+    # checkpoint_signal is received.
+    def execute(self, max_instructions = None, checkpoint_path = None,
+                checkpoint_interval = None, checkpoint_signal = None):
+        if (checkpoint_interval or checkpoint_signal) and not checkpoint_path:
+            raise ValueError('A checkpoint path is needed to save checkpoints')
+        started = time.perf_counter()
+        instructions = self.program.instructions
+        memory = self.memory
+        write = (self.output or sys.stdout).write
+        if self.reader is None:
+            self.reader = Input_Reader(self.input or sys.stdin)
+            self.reader.skip(self.values_read)
+        reader = self.reader
+        read_int = reader.read_int
+        # Checked in int64 mode like any other int addition
+        increment = self.program.operations['+ii']
+        if self.int_mode == 'int64':
+            overflow = self.overflow
+            read_int = lambda: to_int64(reader.read_int(), overflow)
+        end = len(instructions)
+        pc = self.pc
+        executed = self.executed
+        first_executed = executed
+        output_position = self.output_position
+        # Counters of the run summary, only touched by taken jumps and prints
+        jumps = 0
+        prints = 0
+        budget_end = None
+        if max_instructions != None:
+            budget_end = executed + max_instructions
+        previous_handler = None
+        if checkpoint_signal:
+            self.checkpoint_requested = False
+            previous_handler = signal.signal(checkpoint_signal, self.request_checkpoint)
+        next_event = self.next_event(executed, budget_end, checkpoint_interval, checkpoint_signal)
+        try:
+            while pc < end:
+                # Budget, checkpoints and signals are only checked at these counts
+                if executed == next_event:
+                    self.pc = pc
+                    self.executed = executed
+                    self.output_position = output_position
+                    self.values_read = reader.count
+                    # Stop programs that run longer than the allowed instruction budget
+                    if executed == budget_end:
+                        raise RuntimeError(f'Instruction budget of {max_instructions} exceeded at quad {pc}')
+                    if self.checkpoint_requested:
+                        self.save_checkpoint(checkpoint_path)
+                        break
+                    if checkpoint_interval and executed % checkpoint_interval == 0:
+                        self.save_checkpoint(checkpoint_path)
+                    next_event = self.next_event(executed, budget_end, checkpoint_interval, checkpoint_signal)
+                executed += 1
+                operator, handler, l_operand, r_operand, result = instructions[pc]
+
+                # Arithmetic and comparisons, with the handler chosen by decode
+                if handler is not None:
+                    memory[result] = handler(memory[l_operand], memory[r_operand])
+                elif operator == 'Loop':
+                    # Fused increment, compare and jump at the end of a for
+                    value = increment(memory[l_operand], 1)
+                    memory[l_operand] = value
+                    if value <= memory[r_operand]:
+                        pc = result
+                        jumps += 1
+                        continue
+                elif operator == '=':
+                    memory[result] = memory[l_operand]
+                elif operator == 'GotoF':
+                    if not memory[l_operand]:
+                        pc = result
+                        jumps += 1
+                        continue
+                elif operator == 'GotoT':
+                    if memory[l_operand]:
+                        pc = result
+                        jumps += 1
+                        continue
+                elif operator == 'Goto':
+                    pc = result
+                    jumps += 1
                     continue
-            elif operator == 'print':
-                if l_operand_mem == None:
-                    print()
+                elif operator == 'negi' or operator == 'negf' or operator == 'neg':
+                    memory[result] = -memory[r_operand]
+                elif operator == 'print':
+                    if l_operand == None:
+                        text = '\n'
+                    else:
+                        text = str(memory[l_operand])
+                    write(text)
+                    output_position += len(text)
+                    prints += 1
+                elif operator == 'readi':
+                    memory[result] = read_int()
+                elif operator == 'readf':
+                    memory[result] = reader.read_float()
                 else:
-                    print(self.memory[l_operand_mem], end='')
-            else:
-                print("ERROR operator", operator, "not recognized")
-            pc += 1
+                    print("ERROR operator", operator, "not recognized")
+                pc += 1
+            # False when stopped by the checkpoint signal
+            self.finished = pc >= end
+        finally:
+            self.pc = pc
+            self.executed = executed
+            self.output_position = output_position
+            self.values_read = reader.count
+            if checkpoint_signal:
+                signal.signal(checkpoint_signal, previous_handler)
+            self.run_counters = {
+                'instructions': executed - first_executed,
+                'total_instructions': executed,
+                'jumps': jumps,
+                'prints': prints,
+                'values_read': self.values_read,
+                'wall_time': time.perf_counter() - started,
+                'finished': self.finished,
+            }
+        return self.run_counters
+
+
+    # Counters of the last execute and the memory it left behind. Segment use
+    # and bytes walk the whole memory, so they are only computed when asked for.
+    @property
+    def summary(self):
+        if self.run_counters is None:
+            return None
+        segments = {}
+        for name, segment in self.segments().items():
+            segments[name] = {
+                'cells': len(segment),
+                'used': len(segment) - segment.count(None),
+            }
+        return dict(self.run_counters, segments=segments, memory_bytes=self.memory_bytes())
+
+
+    # Bytes of Python memory held by the memory list and its values,
+    # values shared by several cells are counted once
+    def memory_bytes(self):
+        seen = set()
+        total = sys.getsizeof(self.memory)
+        for value in self.memory:
+            if value is not None and id(value) not in seen:
+                seen.add(id(value))
+                total += sys.getsizeof(value)
+        return total
+
+
+    def print_summary(self, summary = None):
+        summary = summary or self.summary
+        lines = ['-- RUN SUMMARY --']
+        for key in ('instructions', 'jumps', 'prints', 'values_read', 'finished'):
+            lines.append(f'{key:<14} {summary[key]}')
+        lines.append(f'{"wall_time":<14} {summary["wall_time"] * 1000:.3f} ms')
+        # The counters returned by execute have no memory figures
+        if 'memory_bytes' in summary:
+            lines.append(f'{"memory_bytes":<14} {summary["memory_bytes"]}')
+            for name, cells in summary['segments'].items():
+                lines.append(f'{name:<14} {cells["used"]}/{cells["cells"]} cells used')
+        print('\n'.join(lines))
+
 
+    #####################################################
+    # Checkpoints
+    #####################################################
+    # Fingerprint of the quadruples and tables, a checkpoint only resumes the same program
+    def program_hash(self):
+        return self.program.hash
 
-    def print_memory(self):
-        for i in range(len(self.memory)):
-            print(f"Memory[{i}] = {self.memory[i]}")
+
+    def save_checkpoint(self, path):
+        state = {
+            'program_hash': self.program_hash(),
+            'pc': self.pc,
+            'executed': self.executed,
+            'output_position': self.output_position,
+            'values_read': self.values_read,
+            'int_mode': self.int_mode,
+            'memory': self.memory,
+        }
+        data = zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL), 1)
+        # Write to a temporary file first so a crash never leaves a broken checkpoint
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as file:
+            file.write(CHECKPOINT_MAGIC)
+            file.write(CHECKPOINT_VERSION.to_bytes(2, 'big'))
+            file.write(data)
+        os.replace(temp_path, path)
+
+
+    def load_checkpoint(self, path):
+        with open(path, 'rb') as file:
+            data = file.read()
+        if data[:len(CHECKPOINT_MAGIC)] != CHECKPOINT_MAGIC:
+            raise ValueError(f'{path} is not a Virtual Machine checkpoint')
+        header = len(CHECKPOINT_MAGIC)
+        version = int.from_bytes(data[header:header + 2], 'big')
+        if version != CHECKPOINT_VERSION:
+            raise ValueError(f'Unsupported checkpoint version {version}')
+        state = Checkpoint_Unpickler(io.BytesIO(zlib.decompress(data[header + 2:]))).load()
+        if state['program_hash'] != self.program_hash():
+            raise ValueError('Checkpoint was saved by a different program')
+        # Unbounded ints of a checkpoint may not fit an int64 machine
+        if state.get('int_mode') != self.int_mode:
+            raise ValueError(f"Checkpoint was saved with int mode {state.get('int_mode')}, not {self.int_mode}")
+        if len(state['memory']) != len(self.memory):
+            raise ValueError('Checkpoint memory does not match the program memory size')
+        # Keep the same list object, memory segments are views over it
+        self.memory[:] = state['memory']
+        self.pc = state['pc']
+        self.executed = state['executed']
+        # Checkpoints of older versions did not count the output
+        if 'output_position' in state:
+            self.output_position = state['output_position']
+            self.rewind_output()
+        # A new reader skips the values read before the checkpoint
+        self.values_read = state.get('values_read', 0)
+        self.reader = None
+        self.finished = False
+
+
+    # Drop the output written after the checkpoint, so the resumed run continues
+    # right after the output it had when the checkpoint was saved. Only outputs
+    # that can be read back and truncated, like files opened with 'w+' or 'r+'
+    # and io.StringIO; elsewhere the output since the checkpoint is printed again.
+    def rewind_output(self):
+        output = self.output or sys.stdout
+        try:
+            if not (output.seekable() and output.readable()):
+                return False
+            # Reading the characters finds their position in any encoding
+            output.seek(0)
+            output.read(self.output_position)
+            # Reading buffers ahead, seeking back to tell() cuts right there
+            output.seek(output.tell())
+            output.truncate()
+        except (OSError, ValueError):
+            return False
+        return True
+
+
+    #####################################################
+    # Memory inspection
+    #####################################################
+    # Segment name -> (first cell, end cell, memory direction of first cell, NumPy dtype)
+    def segment_layout(self):
+        return self.program.segment_layout()
+
+
+    def segment(self, name):
+        layout = self.segment_layout()
+        if name not in layout:
+            raise KeyError(f'Unknown segment {name}, expected one of {list(layout)}')
+        start, end, base_dir, dtype = layout[name]
+        # Ints of the int64 mode always export as int64, cells never written give 0
+        fill = 0 if self.int_mode == 'int64' and dtype == 'int64' else None
+        return Memory_Segment(name, self.memory, start, end, base_dir, dtype, fill)
+
+
+    def segments(self):
+        return {name: self.segment(name) for name in self.segment_layout()}
+
+
+    # Every segment as a NumPy array, see Memory_Segment.to_numpy
+    def export_segments(self, fill = None):
+        return {name: segment.to_numpy(fill=fill) for name, segment in self.segments().items()}
+
+
+    def get_variable(self, name):
+        if name not in self.var_table:
+            raise KeyError(f'Variable {name} was not declared')
+        return self.memory[self.get_memory_dir(self.var_table[name]['memory_dir'])]
+
+
+    # Give a variable its value before execute, used to run a program over many inputs
+    def set_variable(self, name, value):
+        if name not in self.var_table:
+            raise KeyError(f'Variable {name} was not declared')
+        self.memory[self.get_memory_dir(self.var_table[name]['memory_dir'])] = value
+
+
+    def variables(self):
+        return {name: self.get_variable(name) for name in self.var_table}
+
+
+    # Print memory grouped by segment, naming the cells that belong to variables
+    def print_memory(self, segment_names = None):
+        names = {entry['memory_dir']: name for name, entry in self.var_table.items()}
+        lines = []
+        for segment in self.segments().values():
+            if segment_names and segment.name not in segment_names:
+                continue
+            if len(segment) == 0:
+                continue
+            lines.append(f'-- {segment.name} --')
+            for i, value in enumerate(segment):
+                memory_dir = segment.memory_dir(i)
+                label = f' {names[memory_dir]}' if memory_dir in names else ''
+                lines.append(f'Memory[{segment.start + i}] ({memory_dir}){label} = {value}')
+        print('\n'.join(lines))
@@ -1,9 +1,44 @@
+import argparse
+import os
+import signal
+
+from Profiler_Patito import print_profile, profile
 from Scanner_Parser_Patito import PatitoParser, PatitoLexer
 from Virtual_Machine import Virtual_Machine
 
-files = ['main_VM.txt', 'test_elseif.txt']
+arg_parser = argparse.ArgumentParser(description="Run 'Patito' programs on the Virtual Machine.")
+arg_parser.add_argument('files', nargs='*', default=['main_VM.txt', 'test_elseif.txt'],
+                        help='source files, run from last to first')
+arg_parser.add_argument('--checkpoint-interval', type=int, default=None,
+                        help='save a checkpoint to <file>.ckpt every N instructions, '
+                             'and on SIGTERM save one and stop')
+arg_parser.add_argument('--resume', action='store_true',
+                        help='continue from <file>.ckpt when it exists')
+arg_parser.add_argument('--output-file', action='store_true',
+                        help='write the output of each program to <file>.out, '
+                             'a resumed run continues it from the checkpoint')
+arg_parser.add_argument('--int64', choices=['trap', 'wrap'], default=None,
+                        help='run ints as 64-bit integers, trapping or wrapping on overflow')
+arg_parser.add_argument('--stats', action='store_true',
+                        help='print instructions, jumps, prints, time and memory of each run')
+arg_parser.add_argument('--profile', action='store_true',
+                        help='time each compile and run phase and count tokens, reductions, quads and constants')
+args = arg_parser.parse_args()
+
+files = list(args.files)
 
 while len(files) > 0:
+    if args.profile:
+        with open(files.pop(), 'r') as file:
+            data = file.read()
+        try:
+            report = profile(data, 'int64' if args.int64 else None, args.int64 or 'trap')
+            print()
+            print_profile(report)
+        except Exception as e:
+            print('Error profiling program', e)
+        continue
+
     quads = []
     var_table = {}
     cte_table = {}
@@ -21,11 +56,37 @@ while len(files) > 0:
                 print('Parsing error: ', e)
 
     # Create a virtual machine and execute the quadruples
+    checkpoint_path = f + '.ckpt'
+    output = None
+    if args.output_file:
+        # Opened for reading too, so resuming can cut it back to the checkpoint
+        output_path = f + '.out'
+        resuming = args.resume and os.path.exists(checkpoint_path) and os.path.exists(output_path)
+        output = open(output_path, 'r+' if resuming else 'w+')
     try:
-        vm = Virtual_Machine(quads, var_table, cte_table)
-        vm.execute()
+        if args.int64:
+            vm = Virtual_Machine(quads, var_table, cte_table, int_mode='int64', overflow=args.int64,
+                                 output=output)
+        else:
+            vm = Virtual_Machine(quads, var_table, cte_table, output=output)
+        if args.resume and os.path.exists(checkpoint_path):
+            vm.load_checkpoint(checkpoint_path)
+        if args.checkpoint_interval:
+            vm.execute(checkpoint_path=checkpoint_path,
+                       checkpoint_interval=args.checkpoint_interval,
+                       checkpoint_signal=signal.SIGTERM)
+        else:
+            vm.execute()
+        if not vm.finished:
+            print('\nStopped at quad', vm.pc, '- resume with --resume')
+        elif os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        if args.stats:
+            vm.print_summary()
         # Print the memory after execution
         # vm.print_memory()
     except Exception as e:
         print('Error runing program on Virtual Machine', e)
-
+    finally:
+        if output:
+            output.close()
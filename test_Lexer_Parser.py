@@ -1,4 +1,15 @@
+import io
+import os
+import tempfile
+import threading
+
+from Benchmark_Patito import count_temps
+from Linker_Patito import Linker
+from Profiler_Patito import PHASES, profile
 from Scanner_Parser_Patito import PatitoLexer, PatitoParser
+from Stream_Lexer_Patito import Stream_Lexer
+from Vector_VM_Patito import Vector_Virtual_Machine
+from Virtual_Machine import Program, Virtual_Machine
 
 #####################################################
 # Test Lexer
@@ -17,6 +28,27 @@ def test_lexer(data, print_tokens=False):
             print(tok.type, div, tok.value)
 
 
+#####################################################
+# Test Streaming Lexer
+#####################################################
+def test_stream_lexer(data):
+    # Both lexers must produce the same tokens, small chunks split lines
+    lexer = PatitoLexer()
+    lexer.input(data)
+    expected = []
+    while True:
+        tok = lexer.token()
+        if not tok:
+            break
+        expected.append((tok.type, tok.value, tok.lineno, tok.lexpos))
+    tokens = [(tok.type, tok.value, tok.lineno, tok.lexpos)
+              for tok in Stream_Lexer(chunk_size=8).input(data)]
+    if tokens == expected:
+        print('Streaming lexer produced the same', len(tokens), 'tokens')
+    else:
+        print('Streaming lexer differs from PatitoLexer')
+
+
 #####################################################
 # Test Parser
 #####################################################
@@ -30,6 +62,173 @@ def test_parser(data):
         print('Parsing error: ', e)
 
 
+#####################################################
+# Test Input
+#####################################################
+def test_cin(data, input_text):
+    quads, var_table, cte_table = [], {}, {}
+    parser = PatitoParser(True, quads=quads, var_table=var_table, cte_table=cte_table)
+    try:
+        parser.parse(data, lexer=PatitoLexer())
+        vm = Virtual_Machine(quads, var_table, cte_table, input=io.StringIO(input_text))
+        vm.execute()
+    except Exception as e:
+        print('Error: ', e)
+
+
+def test_cin_open_input(data, input_text):
+    # The writer keeps the pipe open, cin has to return with the values already sent
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, input_text.encode())
+    with open(read_fd, 'r') as stream:
+        quads, var_table, cte_table = compile_program(data)
+        vm = Virtual_Machine(quads, var_table, cte_table, input=stream)
+        thread = threading.Thread(target=vm.execute, daemon=True)
+        thread.start()
+        thread.join(timeout=5)
+        print('\nFinished before the input was closed:', not thread.is_alive())
+        os.close(write_fd)
+        thread.join()
+
+
+#####################################################
+# Test Checkpoints
+#####################################################
+def compile_program(data, retarget_assignments=True):
+    quads, var_table, cte_table = [], {}, {}
+    PatitoParser(quads=quads, var_table=var_table, cte_table=cte_table,
+                 retarget_assignments=retarget_assignments).parse(data, lexer=PatitoLexer())
+    return quads, var_table, cte_table
+
+
+def test_checkpoint(data, interval, budget, original, changed):
+    full_output = io.StringIO()
+    full = Virtual_Machine(*compile_program(data), output=full_output)
+    full.execute()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'program.ckpt')
+        # Interrupt the run with an instruction budget, checkpoints every interval instructions.
+        # The output goes on after the checkpoint, the resumed run cuts its file back.
+        output_path = os.path.join(directory, 'program.out')
+        with open(output_path, 'w+') as output:
+            vm = Virtual_Machine(*compile_program(data), output=output)
+            try:
+                vm.execute(max_instructions=budget, checkpoint_path=path, checkpoint_interval=interval)
+            except RuntimeError as e:
+                print('Interrupted:', e)
+        with open(output_path, 'r+') as output:
+            resumed = Virtual_Machine(*compile_program(data), output=output)
+            resumed.load_checkpoint(path)
+            print('Resumed at quad', resumed.pc, 'after', resumed.executed, 'instructions and',
+                  resumed.output_position, 'characters of output')
+            resumed.execute()
+        with open(output_path, 'r') as output:
+            print('Resumed run matches:', resumed.variables() == full.variables()
+                  and output.read() == full_output.getvalue())
+        # Same quadruples but a different constant
+        other = Virtual_Machine(*compile_program(data.replace(original, changed)))
+        try:
+            other.load_checkpoint(path)
+            print('Checkpoint of a different program was loaded')
+        except ValueError as e:
+            print('Error: ', e)
+
+
+#####################################################
+# Test assignment retargeting
+#####################################################
+def test_retarget(data):
+    # Same program compiled with and without retargeting must run the same
+    results = {}
+    for retarget in (False, True):
+        program = Program(*compile_program(data, retarget_assignments=retarget))
+        output = io.StringIO()
+        vm = program.instance(output=output)
+        vm.execute()
+        results[retarget] = (len(program.quadruples), count_temps(program), vm.variables(), output.getvalue())
+    copy, retargeted = results[False], results[True]
+    print('quads', copy[0], '->', retargeted[0], ' temps', copy[1], '->', retargeted[1],
+          ' same variables and output:', copy[2:] == retargeted[2:])
+
+
+#####################################################
+# Test int64 mode
+#####################################################
+def test_int64_export(data):
+    # Cells never written only keep the int64 dtype in int64 mode
+    for int_mode in (None, 'int64'):
+        vm = Virtual_Machine(*compile_program(data), int_mode=int_mode, output=io.StringIO())
+        vm.execute()
+        values = vm.segment('int').to_numpy()
+        print('int mode', int_mode, 'exports', values.dtype, values.tolist())
+        # Unwritten float cells stay None instead of becoming nan
+        values = vm.segment('float').to_numpy()
+        print('float segment exports', values.dtype, values.tolist())
+
+
+#####################################################
+# Test Lockstep Virtual Machine
+#####################################################
+def test_vector_vm(data, table):
+    quads, var_table, cte_table = compile_program(data)
+    vm = Vector_Virtual_Machine(Program(quads, var_table, cte_table), table)
+    vm.execute()
+    columns = vm.columns()
+    for lane in range(vm.lanes):
+        # Each lane must end like its own scalar run, ints wrap like the lanes
+        output = io.StringIO()
+        scalar = Virtual_Machine(quads, var_table, cte_table, int_mode='int64', overflow='wrap', output=output)
+        for name, column in table.items():
+            scalar.set_variable(name, column[lane])
+        error = None
+        try:
+            scalar.execute()
+        except ZeroDivisionError:
+            error = 'division by zero'
+        same = (all(columns[name][lane] == value for name, value in scalar.variables().items())
+                and vm.outputs[lane] == output.getvalue() and vm.errors[lane] == error)
+        print('Lane', lane, 'error', vm.errors[lane], 'matches scalar run:', same)
+
+
+#####################################################
+# Test Linker
+#####################################################
+def test_link(path):
+    # Link twice with the same cache, the second time no unit is compiled
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for _ in range(2):
+            linker = Linker(cache_dir=cache_dir)
+            try:
+                quads, var_table, cte_table = linker.link(path)
+                Virtual_Machine(quads, var_table, cte_table).execute()
+            except Exception as e:
+                print('Error: ', e)
+            print('Compiled:', linker.compiled, 'From cache:', linker.cached)
+
+
+# Units written to a temporary directory, name -> source
+def test_link_units(units, main):
+    with tempfile.TemporaryDirectory() as directory:
+        for name, source in units.items():
+            with open(os.path.join(directory, name + '.txt'), 'w') as file:
+                file.write(source)
+        try:
+            quads, var_table, cte_table = Linker(use_cache=False).link(os.path.join(directory, main + '.txt'))
+            Virtual_Machine(quads, var_table, cte_table).execute()
+        except ValueError as e:
+            print('Error: ', str(e).replace(directory + os.sep, ''))
+
+
+#####################################################
+# Test Profiler
+#####################################################
+def test_profile(data):
+    # Times change on every run, only check that every phase was timed
+    report = profile(data, output=io.StringIO())
+    print('Timed phases:', [phase for phase in PHASES if phase in report['phases']])
+    print('Counts:', report['counts'])
+
+
 #####################################################
 # Test cases for the Lexer and Parser
 #####################################################
@@ -44,6 +243,11 @@ def test_cases():
         print('Testing valid lexer file...')
         test_lexer(data, print_tokens=True)
         print('\n\n')
+    with open('test_lexer_valido.txt', 'r') as file:
+        data = file.read()
+        print('Testing streaming lexer...')
+        test_stream_lexer(data)
+        print('\n\n')
     with open('test_parser_invalido.txt', 'r') as file:
         data = file.read()
         print('Testing invalid parser file...')
@@ -64,6 +268,74 @@ def test_cases():
         print('Testing ELSEIF file...')
         test_parser(data)
         print('\n\n')
+    with open('test_for.txt', 'r') as file:
+        data = file.read()
+        print('Testing FOR file...')
+        test_parser(data)
+        print('\n\n')
+    with open('test_cin.txt', 'r') as file:
+        data = file.read()
+        print('Testing CIN file...')
+        test_cin(data, '4\n10 20\n30 40\n1.5 4')
+        print()
+        test_cin_open_input(data, '4\n10 20\n30 40\n1.5 4\n')
+        print('\n\n')
+    with open('main_VM.txt', 'r') as file:
+        data = file.read()
+        print('Testing checkpoints...')
+        test_checkpoint(data, 1000, 2500, 'nfib = 300;', 'nfib = 301;')
+        print('\n\n')
+    print('Testing lockstep Virtual Machine...')
+    # Lanes loop a different number of times, branch apart and one divides by zero
+    test_vector_vm('''program LANES;
+var i, n, d, total: int; ratio: float;
+{
+    ratio = 0.5;
+    total = 0;
+    for i = 1 to n {
+        total = total + i;
+    };
+    if(total > 10){
+        cout("big ", total);
+    }
+    else{
+        cout("small ", total);
+    };
+    ratio = total / d;
+    cout(" ratio ", ratio);
+}
+end''', {'n': [3, 6, 0, 5], 'd': [2, 4, 3, 0]})
+    print('\n\n')
+    print('Testing assignment retargeting...')
+    for file_name in ('test_for.txt', 'test_elseif.txt', 'main_VM.txt'):
+        with open(file_name, 'r') as file:
+            test_retarget(file.read())
+    # Values that are a variable or a constant are copied, nothing to retarget
+    test_retarget('program COPY; var a, b: int; { a = 5; b = a; cout(a, " ", b); } end')
+    print('\n\n')
+    print('Testing int64 export...')
+    test_int64_export('program INT; var a, b: int; x: float; { a = 3; } end')
+    print('\n\n')
+    print('Testing IMPORT file...')
+    test_link('test_import.txt')
+    # Two units that do not import each other cannot define the same variable
+    test_link_units({
+        'A': 'program A; var i, result: int; { result = 1; } end',
+        'B': 'program B; var i, result: int; { result = 2; } end',
+        'Main': 'program Main; import A; import B; { cout(result); } end',
+    }, 'Main')
+    # An int and a float constant with the same value keep their types
+    test_link_units({
+        'K': 'program K; var k: int; { k = 1; } end',
+        'F': 'program F; var f: float; { f = 1.0; } end',
+        'Main': 'program Main; import K; import F; { cout(k, " ", f); } end',
+    }, 'Main')
+    print('\n\n')
+    with open('test_for.txt', 'r') as file:
+        data = file.read()
+        print('Testing profiler...')
+        test_profile(data)
+        print('\n\n')
 
 # Excecute test cases
 test_cases()
\ No newline at end of file